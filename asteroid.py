@@ -1,59 +1,109 @@
 import pygame
 import random
-import math
 
 from circleshape import CircleShape
-from constants import ASTEROID_MIN_RADIUS
+from spritecache import draw_polygon
+from config import default_config
+from powerup import PowerUp, SpawnTable
+from shapes import shape_library
 
 
 class Asteroid(CircleShape):
+    tags = ("asteroid",)
+    rng = random  # Per-game random.Random stream, set in create_world()
+    powerup_class = PowerUp  # Dropped by the smallest asteroids, per world like rng
+    powerup_table = SpawnTable(default_config.powerup_weights)  # Which power-up drops
+    shapes = shape_library  # Outline templates shared by every world
+    spawner = None  # The world's SpawnQueue, which builds split pieces; None builds them straight away
+
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
-        self.lumps = self._generate_lumps()
-
-    def _generate_lumps(self):
-        num_points = random.randint(8, 12)
-        points = []
-        for i in range(num_points):
-            angle = (2 * math.pi * i) / num_points
-            radius_variation = random.uniform(0.7, 1.3)
-            actual_radius = self.radius * radius_variation
-            x = actual_radius * math.cos(angle)
-            y = actual_radius * math.sin(angle)
-            points.append(pygame.Vector2(x, y))
-        return points
+        self.shape, self.rotation = self.shapes.pick(radius, self.rng)
+
+    @classmethod
+    def restore(cls, x, y, radius, velocity, shape_index, rotation):
+        """Recreate a saved asteroid without drawing from the rng"""
+        asteroid = cls.__new__(cls)
+        CircleShape.__init__(asteroid, x, y, radius)
+        asteroid.load_state(x, y, radius, velocity, shape_index, rotation)
+        return asteroid
+
+    def load_state(self, x, y, radius, velocity, shape_index, rotation):
+        """Overwrite this asteroid with saved state, reusing the sprite"""
+        self.position = pygame.Vector2(x, y)
+        self.velocity = velocity
+        self.radius = radius
+        self.shape = self.shapes.pool(radius)[shape_index]
+        self.rotation = rotation
+
+    @property
+    def hit_radius(self):
+        if self.config.polygon_collisions:
+            return self.shape.extent
+        return self.radius
+
+    @property
+    def box(self):
+        """(min x, min y, max x, max y) of the outline around the origin"""
+        return self.shape.bounds[self.rotation]
+
+    @property
+    def outline(self):
+        """Outline around the origin as (x, y) tuples, for hit tests"""
+        return self.shape.polygon(self.rotation)
+
+    @property
+    def lumps(self):
+        """Outline around the origin as Vector2 points"""
+        return self.shape.points(self.rotation)
 
     def draw(self, screen):
-        world_points = []
-        for point in self.lumps:
-            world_point = self.position + point
-            world_points.append(world_point)
-        
-        if len(world_points) > 2:
-            pygame.draw.polygon(screen, "white", world_points, 2)
+        shape = self.shape
+        rotation = self.rotation
+        return draw_polygon(screen, self.position, shape.baked(rotation), lambda: shape.points(rotation))
 
     def update(self, dt):
         self.position += self.velocity * dt
         self.wrap_screen()
 
+    def kill(self):
+        alive = self.alive()
+        super().kill()
+        if alive and self.spawner is not None:
+            self.spawner.recycle(self)
+
     def split(self):
-        is_smallest = self.radius == ASTEROID_MIN_RADIUS
-        position = self.position.copy()  # Save position before killing
+        radius = self.radius
+        min_radius = self.config.asteroid_min_radius
+        is_smallest = radius == min_radius
+        # Save state before killing
+        position = self.position.copy()
+        velocity = self.velocity.copy()
         
         self.kill()
 
-        # Spawn shield power-up with 10% chance when smallest asteroid is destroyed
+        # Spawn a power-up by chance when smallest asteroid is destroyed
         if is_smallest:
-            if random.random() < 0.1:  # 10% chance
-                from powerup import ShieldPowerUp
-                power_up = ShieldPowerUp(position.x, position.y)
+            if self.rng.random() < self.config.powerup_drop_chance:
+                effect = self.powerup_table.pick(self.rng)
+                if effect:
+                    self.powerup_class(position.x, position.y, effect)
             return
 
-        new_radius = self.radius - ASTEROID_MIN_RADIUS
-        angle = random.uniform(25, 50)
+        new_radius = radius - min_radius
+        angle = self.rng.uniform(25, 50)
+
+        if self.spawner is not None:
+            # Pick shapes now so the rng is drawn in the same order however long the pieces wait
+            for turn in (angle, -angle):
+                shape, rotation = self.shapes.pick(new_radius, self.rng)
+                self.spawner.push(position.x, position.y, new_radius, velocity.rotate(turn) * 1.2,
+                                  shape.index, rotation)
+            return
 
-        fst = Asteroid(self.position.x, self.position.y, new_radius)
-        fst.velocity = self.velocity.rotate(angle) * 1.2
+        # type(self) so subclasses (e.g. store-backed asteroids) split into their own kind
+        fst = type(self)(position.x, position.y, new_radius)
+        fst.velocity = velocity.rotate(angle) * 1.2
         
-        snd = Asteroid(self.position.x, self.position.y, new_radius)
-        snd.velocity = self.velocity.rotate(-angle) * 1.2
\ No newline at end of file
+        snd = type(self)(position.x, position.y, new_radius)
+        snd.velocity = velocity.rotate(-angle) * 1.2
\ No newline at end of file
@@ -1,60 +1,72 @@
 import pygame
 import random
 from asteroid import Asteroid
-from constants import *
+from config import default_config
 
 
 class AsteroidField(pygame.sprite.Sprite):
-    edges = [
-        [
-            pygame.Vector2(1, 0),
-            lambda y: pygame.Vector2(-ASTEROID_MAX_RADIUS, y * SCREEN_HEIGHT),
-        ],
-        [
-            pygame.Vector2(-1, 0),
-            lambda y: pygame.Vector2(
-                SCREEN_WIDTH + ASTEROID_MAX_RADIUS, y * SCREEN_HEIGHT
-            ),
-        ],
-        [
-            pygame.Vector2(0, 1),
-            lambda x: pygame.Vector2(x * SCREEN_WIDTH, -ASTEROID_MAX_RADIUS),
-        ],
-        [
-            pygame.Vector2(0, -1),
-            lambda x: pygame.Vector2(
-                x * SCREEN_WIDTH, SCREEN_HEIGHT + ASTEROID_MAX_RADIUS
-            ),
-        ],
-    ]
+    asteroid_class = Asteroid
+    rng = random  # Per-game random.Random stream, set in create_world()
+    config = default_config  # World settings, set per world in create_world()
+    registry = None  # The world's Registry, set in create_world()
+    spawner = None  # The world's SpawnQueue, set in create_world(); None spawns straight away
 
     def __init__(self):
         pygame.sprite.Sprite.__init__(self, self.containers)
         self.spawn_timer = 0.0
+        self.edges = self._edges()
+
+    def _edges(self):
+        """Spawn direction and position along each screen edge, just out of sight"""
+        width = self.config.screen_width
+        height = self.config.screen_height
+        margin = self.config.asteroid_max_radius
+        return [
+            [
+                pygame.Vector2(1, 0),
+                lambda y: pygame.Vector2(-margin, y * height),
+            ],
+            [
+                pygame.Vector2(-1, 0),
+                lambda y: pygame.Vector2(width + margin, y * height),
+            ],
+            [
+                pygame.Vector2(0, 1),
+                lambda x: pygame.Vector2(x * width, -margin),
+            ],
+            [
+                pygame.Vector2(0, -1),
+                lambda x: pygame.Vector2(x * width, height + margin),
+            ],
+        ]
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = self.asteroid_class(position.x, position.y, radius)
         asteroid.velocity = velocity
+        return asteroid
 
     def update(self, dt):
         self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE:
+        if self.spawn_timer > self.config.asteroid_spawn_rate:
             self.spawn_timer = 0
 
-            # Only spawn if we haven't reached the maximum count
-            # Count current asteroids by checking the containers
-            current_asteroid_count = 0
-            for group in Asteroid.containers:
-                if hasattr(group, '__len__'):
-                    current_asteroid_count = len(group)
-                    break
-            
-            if current_asteroid_count < ASTEROID_MAX_COUNT:
+            # Only spawn if we haven't reached the maximum count, counting queued asteroids
+            count = self.registry.count("asteroid")
+            max_count = self.config.asteroid_max_count
+            if self.spawner is not None:
+                count += len(self.spawner)
+                max_count = self.spawner.limit(max_count)
+            if count < max_count:
                 # spawn a new asteroid at a random edge
-                edge = random.choice(self.edges)
-                speed = random.randint(40, 100)
+                edge = self.rng.choice(self.edges)
+                speed = self.rng.randint(40, 100)
                 velocity = edge[0] * speed
-                velocity = velocity.rotate(random.randint(-30, 30))
-                position = edge[1](random.uniform(0, 1))
-                kind = random.randint(1, ASTEROID_KINDS)
-                self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
+                velocity = velocity.rotate(self.rng.randint(-30, 30))
+                position = edge[1](self.rng.uniform(0, 1))
+                kind = self.rng.randint(1, self.config.asteroid_kinds)
+                radius = self.config.asteroid_min_radius * kind
+                if self.spawner is not None:
+                    shape, rotation = self.asteroid_class.shapes.pick(radius, self.rng)
+                    self.spawner.push(position.x, position.y, radius, velocity, shape.index, rotation)
+                else:
+                    self.spawn(radius, position, velocity)
\ No newline at end of file
@@ -0,0 +1,349 @@
+"""Headless benchmarks for update, collision and draw at fixed scene sizes.
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.2
+    python benchmark.py --memory
+
+Scenes are built from the game's own classes with a fixed seed, so every
+run steps through exactly the same frames. --compare exits with status 1
+when any phase got slower than the baseline by more than the threshold.
+--memory instead reports the bytes each slotted kind of entity takes and
+how long updating all of them takes per frame, next to the same class with
+an instance __dict__. Shots, asteroids and ships are pygame sprites, which
+need a __dict__, so they stay unslotted and are not in the table.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from config import Config
+from gamestate import GameStateMachine, PlayingState
+from simulation import create_world
+from profiler import Profiler
+from powerup import PlayerShield
+from weapons import Beam
+from spritecache import RENDER_MODES, set_render_mode, pixel_comparison
+
+BENCHMARK_SEED = 1234
+PHASES = ("update", "collision", "spawn", "draw")
+METRICS = ("mean", "p50", "p95", "p99")
+
+
+def random_position(rng, config):
+    return pygame.Vector2(rng.uniform(0, config.screen_width), rng.uniform(0, config.screen_height))
+
+
+def random_velocity(rng):
+    return pygame.Vector2(0, rng.randint(40, 100)).rotate(rng.uniform(0, 360))
+
+
+def add_asteroids(world, count):
+    """Spawn large asteroids through the field and split them, like a busy game"""
+    field = world.asteroid_field
+    rng = world.rng
+    config = world.config
+
+    for _ in range(count // 2):
+        field.spawn(config.asteroid_max_radius, random_position(rng, config), random_velocity(rng)).split()
+    if count % 2:
+        field.spawn(config.asteroid_max_radius, random_position(rng, config), random_velocity(rng))
+    # The scene needs them now, not a spawn budget at a time
+    world.spawner.flush()
+
+
+def add_shots(player, count):
+    """Fire at least count shots from a player strafing around the screen"""
+    rng = player.rng
+    pool = player.shot_pool
+    wanted = pool.live + count
+    while pool.live < wanted:
+        player.position = random_position(rng, player.config)
+        player.rotation = rng.uniform(0, 360)
+        player.shooting_limiter = 0
+        player.spawn_protection = 0
+        player.shoot(0)
+
+
+def add_explosions(world, count):
+    rng = world.rng
+    for _ in range(count):
+        world.asteroid_explosions.add(
+            world.create_explosion(random_position(rng, world.config))
+        )
+
+
+class Scene:
+    """Keeps a game topped up to fixed numbers of asteroids, shots and explosions.
+
+    fill() runs before every frame, outside the timed phases, so shots that
+    hit or leave the screen and asteroids that get split are replaced and
+    the load stays the same for the whole run.
+    """
+
+    def __init__(self, asteroids=0, shots=0, explosions=0, weapon=None):
+        self.asteroids = asteroids
+        self.shots = shots
+        self.explosions = explosions
+        self.weapon = weapon  # Weapon power-up the ship holds for the whole run
+
+    def start(self, world):
+        # The ship only fires; a ship collision would clear the whole screen
+        self.gunner = world.player
+        self.gunner.kill()
+        self.gunner.rng = world.rng
+        if self.weapon:
+            self.gunner.active_powerups[self.weapon] = math.inf
+        world.player = None
+        self.fill(world)
+
+    def fill(self, world):
+        missing = self.asteroids - len(world.asteroids)
+        if missing > 0:
+            add_asteroids(world, missing)
+        missing = self.shots - len(world.shots)
+        if missing > 0:
+            add_shots(self.gunner, missing)
+        missing = self.explosions - len(world.asteroid_explosions)
+        if missing > 0:
+            add_explosions(world, missing)
+
+
+# Shots kept flying in the asteroid scenes, so the collision phase has the
+# same work to do at every size and only the asteroid count changes
+SHOT_STREAM = 100
+
+SCENARIOS = {
+    'asteroids_10': Scene(asteroids=10, shots=SHOT_STREAM),
+    'asteroids_100': Scene(asteroids=100, shots=SHOT_STREAM),
+    'asteroids_1k': Scene(asteroids=1000, shots=SHOT_STREAM),
+    'asteroids_10k': Scene(asteroids=10000, shots=SHOT_STREAM),
+    'shots_1k': Scene(asteroids=100, shots=1000),
+    'explosions_100': Scene(asteroids=100, explosions=100),
+    'spread_1k': Scene(asteroids=100, shots=1000, weapon='spread'),
+    'homing_500': Scene(asteroids=100, shots=500, weapon='homing'),
+}
+
+
+def run_scenario(scene, screen, font, frames, warmup, use_entity_store=False, config=None):
+    """Step one scene for warmup + frames ticks and return per-phase timing stats"""
+    world = create_world(font, use_entity_store=use_entity_store, seed=BENCHMARK_SEED, config=config)
+    state = PlayingState(GameStateMachine(), world)
+    state.enter()
+    scene.start(world)
+
+    timer = Profiler(window=frames)
+    timer.enabled = True
+    dt = world.timestep
+
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            timer.reset()
+        scene.fill(world)
+
+        with timer.section("update"):
+            state.update_entities(dt)
+            state.update_effects(dt)
+
+        with timer.section("collision"):
+            state.collide_player()
+            state.collide_powerups()
+            state.collide_weapons(dt)
+            state.collide_shots(dt)
+
+        with timer.section("spawn"):
+            world.spawner.update()
+
+        screen.fill("black")
+        with timer.section("draw"):
+            state.draw(screen)
+
+    result = {row['section']: row for row in timer.stats()}
+    for row in result.values():
+        del row['section']
+    result['asteroids'] = len(world.asteroids)
+    result['shots'] = len(world.shots)
+    return result
+
+
+def best_of(runs, metric):
+    """Merge repeated runs, keeping each phase from the run where it was fastest"""
+    key = metric + "_ms"
+    best = dict(runs[0])
+    for phase in PHASES:
+        best[phase] = min((run[phase] for run in runs), key=lambda row: row[key])
+    return best
+
+
+def compare(results, baseline, threshold, metric, min_ms):
+    """Return (scenario, phase, before, after) for every phase slower than the threshold allows"""
+    regressions = []
+    key = metric + "_ms"
+    for name, phases in results['scenarios'].items():
+        before_phases = baseline['scenarios'].get(name)
+        if not before_phases:
+            continue
+        for phase in PHASES:
+            if phase not in phases or phase not in before_phases:
+                continue
+            before = before_phases[phase][key]
+            after = phases[phase][key]
+            # Sub-min_ms phases are mostly timer noise
+            if after > before * (1 + threshold) and after - before > min_ms:
+                regressions.append((name, phase, before, after))
+    return regressions
+
+
+def print_results(results, metric):
+    key = metric + "_ms"
+    print(f"{'scenario':<16}{'asteroids':>10}{'shots':>7}" + "".join(f"{phase:>12}" for phase in PHASES) + f"  ({metric} ms)")
+    for name, phases in results['scenarios'].items():
+        timings = "".join(f"{phases[phase][key]:>12.3f}" for phase in PHASES)
+        print(f"{name:<16}{phases['asteroids']:>10}{phases['shots']:>7}{timings}")
+
+
+def bytes_per_instance(factory, count):
+    """Traced allocation per object for count objects made by factory, kept alive together"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return used / count
+
+
+def update_ms(factory, count, frames=60, repeat=3):
+    """Fastest time per frame to update count objects made by factory, in milliseconds"""
+    items = [factory() for _ in range(count)]
+    dt = 1 / 60
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(frames):
+            for item in items:
+                item.update(dt)
+        best = min(best, (time.perf_counter() - started) / frames)
+    return best * 1000
+
+
+def measure_memory(count, config=None):
+    """(entity, slotted bytes, __dict__ bytes, slotted ms, __dict__ ms) for each slotted entity kind.
+
+    The times are for updating all count objects once. Sprites (ships,
+    asteroids, shots) keep pygame's instance __dict__, so they have nothing
+    to compare and are left out.
+    """
+    world = create_world(seed=BENCHMARK_SEED, config=config)
+    world.rng.seed(BENCHMARK_SEED)
+    # No particle budget, so explosions measure only themselves and not the shared buffer
+    world.particles.budgets = dict.fromkeys(world.particles.budgets, 0)
+    kinds = {
+        'ScoreAnimation': (world.ScoreAnimation, lambda cls: cls(1.0, 2.0, "+100")),
+        'PlayerShield': (PlayerShield, lambda cls: cls()),
+        'AsteroidExplosion': (world.AsteroidExplosion, lambda cls: cls(1.0, 2.0, 30)),
+        'PlayerExplosion': (world.PlayerExplosion, lambda cls: cls(1.0, 2.0, 0.0)),
+        'Beam': (Beam, lambda cls: cls(pygame.Vector2(1, 2), pygame.Vector2(0, 1), 100.0, 0.1)),
+    }
+    rows = []
+    for name, (cls, make) in kinds.items():
+        unslotted = type(cls.__name__, (cls,), {})
+        rows.append((name, bytes_per_instance(lambda: make(cls), count),
+                     bytes_per_instance(lambda: make(unslotted), count),
+                     update_ms(lambda: make(cls), count), update_ms(lambda: make(unslotted), count)))
+    return rows
+
+
+def print_memory(rows, count):
+    print(f"{'':<20}{'bytes each':>28}{f'update ms per frame, {count} each':>36}")
+    print(f"{'entity':<20}" + f"{'slotted':>10}{'__dict__':>10}{'saved':>8}" * 2)
+    for name, slotted, unslotted, slotted_ms, unslotted_ms in rows:
+        print(f"{name:<20}{slotted:>10.0f}{unslotted:>10.0f}{unslotted - slotted:>8.0f}"
+              f"{slotted_ms:>10.3f}{unslotted_ms:>10.3f}{unslotted_ms - slotted_ms:>8.3f}")
+    print("Shot, Asteroid and Player are pygame sprites and stay unslotted, so they are not compared.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Asteroids benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--frames", type=int, default=60, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed frames before timing starts")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run each scenario this many times and keep the fastest (less noisy)")
+    parser.add_argument("--entity-store", action="store_true", help="keep asteroid and shot motion in NumPy arrays")
+    parser.add_argument("--render-mode", choices=RENDER_MODES, default="baked",
+                        help="how sprites are drawn (default baked); compare also reports pixel differences")
+    Config.add_arguments(parser)
+    parser.add_argument("--save", metavar="PATH", help="write the results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown as a fraction of the baseline (default 0.2)")
+    parser.add_argument("--metric", choices=METRICS, default="p50", help="statistic to compare")
+    parser.add_argument("--min-ms", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--memory", type=int, nargs="?", const=10000, metavar="COUNT",
+                        help="report per-entity memory and update time from COUNT instances of each kind (default 10000) and exit")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = Config.from_args(args)
+    set_render_mode(args.render_mode)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((config.screen_width, config.screen_height))
+    font = pygame.font.Font("medodica/MedodicaRegular.otf", 36)
+
+    if args.memory:
+        print_memory(measure_memory(args.memory, config), args.memory)
+        return 0
+
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        'frames': args.frames,
+        'entity_store': args.entity_store,
+        'render_mode': args.render_mode,
+        'config': config.to_dict(),
+        'python': sys.version.split()[0],
+        'pygame': pygame.version.ver,
+        'scenarios': {},
+    }
+    for name in names:
+        runs = [
+            run_scenario(SCENARIOS[name], screen, font, args.frames, args.warmup, args.entity_store, config)
+            for _ in range(args.repeat)
+        ]
+        results['scenarios'][name] = best_of(runs, args.metric)
+    print_results(results, args.metric)
+    if args.render_mode == "compare":
+        print(pixel_comparison.report())
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.metric, args.min_ms)
+        for name, phase, before, after in regressions:
+            print(f"REGRESSION {name} {phase}: {before:.3f} ms -> {after:.3f} ms ({after / before - 1:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
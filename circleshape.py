@@ -1,8 +1,12 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from config import default_config
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    config = default_config  # World settings, set per world in create_world()
+    tags = ()  # Registry tags this kind of shape is filed under
+    expired = None  # List collecting shapes that ran out during an update pass, set per world
+
     def __init__(self, x, y, radius):
         if hasattr(self, "containers"):
             super().__init__(self.containers)
@@ -19,20 +23,35 @@ class CircleShape(pygame.sprite.Sprite):
     def update(self, dt):
         pass
 
+    @property
+    def hit_radius(self):
+        """Radius of a circle around everything this shape can collide with"""
+        return self.radius
+
+    def expire(self):
+        """Kill a shape that ran out of life, or queue it if the world kills them in registry order"""
+        if self.expired is None:
+            self.kill()
+        else:
+            self.expired.append(self)
+
     def colliding_with(self, other):
         distance = self.position.distance_to(other.position)
 
         return distance <= self.radius + other.radius
 
     def wrap_screen(self):
+        width = self.config.screen_width
+        height = self.config.screen_height
+
         # Wrap horizontal position
         if self.position.x < -self.radius:
-            self.position.x = SCREEN_WIDTH + self.radius
-        elif self.position.x > SCREEN_WIDTH + self.radius:
+            self.position.x = width + self.radius
+        elif self.position.x > width + self.radius:
             self.position.x = -self.radius
             
         # Wrap vertical position
         if self.position.y < -self.radius:
-            self.position.y = SCREEN_HEIGHT + self.radius
-        elif self.position.y > SCREEN_HEIGHT + self.radius:
+            self.position.y = height + self.radius
+        elif self.position.y > height + self.radius:
             self.position.y = -self.radius
\ No newline at end of file
@@ -0,0 +1,153 @@
+import copy
+import json
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+import constants
+
+# World settings read at runtime. Each defaults to the constant of the same
+# name in upper case; rendering and tooling constants stay in constants.py
+SETTINGS = (
+    'screen_width',
+    'screen_height',
+    'asteroid_kinds',
+    'asteroid_min_radius',
+    'asteroid_spawn_rate',
+    'asteroid_max_count',
+    'asteroid_spawn_budget',
+    'asteroid_prewarm',
+    'powerup_drop_chance',
+    'powerup_weights',
+    'powerup_durations',
+    'powerup_speed_boost',
+    'powerup_rapid_fire_rate',
+    'powerup_bomb_radius',
+    'weapon_cooldowns',
+    'weapon_spreads',
+    'weapon_shot_speeds',
+    'homing_turn_rate',
+    'laser_beam_lifetime',
+    'player_radius',
+    'player_turn_acceleration',
+    'player_max_turn_speed',
+    'player_turn_drag',
+    'player_acceleration',
+    'player_max_speed',
+    'player_drag',
+    'player_shoot_speed',
+    'player_shoot_cooldown',
+    'shot_radius',
+    'shot_lifetime',
+    'shot_pool_size',
+    'spatial_hash_cell_size',
+    'swept_collisions',
+    'polygon_collisions',
+    'player_lives',
+    'respawn_time',
+    'particle_capacity',
+    'particle_damping',
+    'particle_budgets',
+    'fixed_timestep',
+)
+
+
+class Config:
+    """Settings for one game world.
+
+    `Config(asteroid_max_count=1000)` overrides single settings; load()
+    reads a TOML or JSON file of them. Keys are matched case-insensitively,
+    so files may use either `asteroid_max_count` or `ASTEROID_MAX_COUNT`.
+    """
+
+    def __init__(self, **settings):
+        for name in SETTINGS:
+            setattr(self, name, copy.deepcopy(getattr(constants, name.upper())))
+        self.update(settings)
+
+    @property
+    def asteroid_max_radius(self):
+        return self.asteroid_min_radius * self.asteroid_kinds
+
+    def update(self, settings):
+        """Override settings from a mapping; returns self"""
+        for key, value in settings.items():
+            name = key.lower()
+            if name not in SETTINGS:
+                raise ValueError(f"Unknown setting: {key}")
+            setattr(self, name, _coerce(key, value, getattr(constants, name.upper())))
+        return self
+
+    def set(self, assignment):
+        """Apply one NAME=VALUE override, with VALUE parsed as JSON"""
+        key, sep, text = assignment.partition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=VALUE, got {assignment!r}")
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = text
+        return self.update({key.strip(): value})
+
+    def copy(self, **settings):
+        return Config(**self.to_dict()).update(settings)
+
+    def to_dict(self):
+        return {name: copy.deepcopy(getattr(self, name)) for name in SETTINGS}
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML config files need Python 3.11 or newer")
+            with open(path, "rb") as f:
+                return cls(**tomllib.load(f))
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    @staticmethod
+    def add_arguments(parser):
+        """Add the --config and --set options read by from_args()"""
+        parser.add_argument("--config", metavar="PATH", help="load world settings from a .toml or .json file")
+        parser.add_argument("--set", action="append", metavar="NAME=VALUE",
+                            help="override one world setting, e.g. --set asteroid_max_count=100 (repeatable)")
+
+    @classmethod
+    def from_args(cls, args, settings=None):
+        """Build from parsed --config and --set options, starting from settings if no --config is given"""
+        config = cls.load(args.config) if args.config else cls(**(settings or {}))
+        for assignment in args.set or ():
+            config.set(assignment)
+        return config
+
+    def __repr__(self):
+        changed = {name: value for name, value in self.to_dict().items()
+                   if value != getattr(constants, name.upper())}
+        return f"Config({', '.join(f'{name}={value!r}' for name, value in changed.items())})"
+
+
+def _coerce(key, value, default):
+    # Settings keep the type of their default, so a typo fails here and not mid-game
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(default, int):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+    elif isinstance(default, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif isinstance(default, dict):
+        if isinstance(value, dict):
+            merged = dict(default)
+            merged.update(value)
+            return merged
+    raise ValueError(f"{key} must be {type(default).__name__}, got {value!r}")
+
+
+# Settings used by entities that were not created for a particular world
+default_config = Config()
@@ -6,6 +6,50 @@ ASTEROID_MIN_RADIUS = 20
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
 ASTEROID_SPAWN_RATE = 0.8  # seconds
 ASTEROID_MAX_COUNT = 8  # maximum asteroids on screen
+ASTEROID_SPAWN_BUDGET = 16  # asteroids built per tick at most; bursts of splits wait their turn
+ASTEROID_PREWARM = 32  # spare asteroid objects built ahead on ticks with budget left over
+POWERUP_DROP_CHANCE = 0.1  # chance the smallest asteroids drop a power-up when destroyed
+# Relative odds of each power-up in a drop
+POWERUP_WEIGHTS = {
+    "shield": 4,
+    "speed": 3,
+    "rapid_fire": 3,
+    "bomb": 2,
+    "spread": 2,
+    "laser": 1,
+    "homing": 2,
+}
+# Seconds the timed power-ups last
+POWERUP_DURATIONS = {
+    "speed": 8.0,
+    "rapid_fire": 8.0,
+    "spread": 10.0,
+    "laser": 10.0,
+    "homing": 10.0,
+}
+POWERUP_SPEED_BOOST = 1.5  # acceleration and top speed multiplier
+POWERUP_RAPID_FIRE_RATE = 3.0  # shot cooldown divisor
+POWERUP_BOMB_RADIUS = 200  # pixels
+
+# Weapons by name, see weapons.py. Cooldowns are multiples of PLAYER_SHOOT_COOLDOWN
+WEAPON_COOLDOWNS = {
+    "blaster": 1.0,
+    "spread": 1.5,
+    "homing": 2.0,
+    "laser": 1.5,
+}
+# Angles of the shots in one volley, in degrees from the ship's heading
+WEAPON_SPREADS = {
+    "spread": [-24, -12, 0, 12, 24],
+    "homing": [-30, 30],
+}
+# Shot speeds as fractions of PLAYER_SHOOT_SPEED
+WEAPON_SHOT_SPEEDS = {
+    "spread": 1.0,
+    "homing": 0.6,
+}
+HOMING_TURN_RATE = 240.0  # degrees per second a homing missile can turn
+LASER_BEAM_LIFETIME = 0.12  # seconds a laser beam stays on screen
 
 PLAYER_RADIUS = 20
 PLAYER_TURN_ACCELERATION = 800
@@ -19,10 +63,45 @@ PLAYER_SHOOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN = 0.3 #seconds
 
 SHOT_RADIUS = 5
+SHOT_LIFETIME = 3.0  # seconds, long enough to cross the screen
+SHOT_POOL_SIZE = 64  # shots preallocated by the shot pool
+
+SPATIAL_HASH_CELL_SIZE = 64  # pixels per broadphase grid cell
+SWEPT_COLLISIONS = True  # test shots against asteroids along their whole motion each tick, so fast shots can't tunnel
+POLYGON_COLLISIONS = True  # collide the ship's triangle and the asteroids' outlines instead of their circles
 
 PLAYER_LIVES = 3
 RESPAWN_TIME = 2.0  # seconds
 
+PARTICLE_CAPACITY = 4096  # particles alive at once, oldest are overwritten
+PARTICLE_DAMPING = 0.98  # velocity kept per tick
+# Most particles each kind of emitter may have alive, so chain reactions can't flood the buffer
+PARTICLE_BUDGETS = {
+    "asteroid": 1500,
+    "player": 60,
+}
+
+# How asteroids and the ship are drawn by default (--render-mode): "baked" blits cached surfaces,
+# "vector" draws polygons every frame, "compare" draws vectors and reports pixel mismatches on exit
+SPRITE_RENDER_MODE = "baked"
+SHIP_ROTATION_STEPS = 120  # cached ship rotations, 3 degrees apart
+SHAPE_TEMPLATES = 16  # asteroid outlines generated per radius class
+SHAPE_ROTATIONS = 32  # rotation steps an asteroid outline can be drawn at
+SHAPE_SEED = 1979  # seeds the outline templates, so they match across runs
+
+DIRTY_RECT_LIMIT = 64  # more changed rects than this and the renderer flips the whole screen
+DIRTY_AREA_LIMIT = 0.5  # same, for the fraction of the screen covered by changed rects
+
+PROFILER_WINDOW = 600  # samples per timer kept for percentiles, 10 seconds at 60 FPS
+
+TEXT_CACHE_SIZE = 128  # rendered text surfaces kept by the text cache
+
+DENSITY_TARGET_FRAME_TIME = 0.014  # seconds of work per frame above which the game thins out asteroids
+DENSITY_MIN_SCALE = 0.25  # fraction of ASTEROID_MAX_COUNT density control never goes below
+
+FIXED_TIMESTEP = 1 / 60  # seconds per simulation tick
+MAX_STEPS_PER_FRAME = 5  # ticks run per rendered frame before dropping time
+
 # Game states
 GAME_STATE_START = 0
 GAME_STATE_PLAYING = 1
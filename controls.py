@@ -0,0 +1,86 @@
+import random
+
+import pygame
+
+
+class Controls:
+    """Player inputs for a single simulation tick"""
+
+    def __init__(self, left=False, right=False, thrust=False, reverse=False, shoot=False):
+        self.left = left
+        self.right = right
+        self.thrust = thrust
+        self.reverse = reverse
+        self.shoot = shoot
+
+    def to_mask(self):
+        """Pack into one byte for replay logs"""
+        return ((self.left and 1) | (self.right and 2) | (self.thrust and 4) |
+                (self.reverse and 8) | (self.shoot and 16))
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls(bool(mask & 1), bool(mask & 2), bool(mask & 4), bool(mask & 8), bool(mask & 16))
+
+
+class KeyboardInput:
+    """Reads controls from the pygame keyboard state (needs a display)"""
+
+    def poll(self):
+        keys = pygame.key.get_pressed()
+        return Controls(
+            left=keys[pygame.K_a],
+            right=keys[pygame.K_d],
+            thrust=keys[pygame.K_w],
+            reverse=keys[pygame.K_s],
+            shoot=keys[pygame.K_SPACE],
+        )
+
+
+class ScriptedInput:
+    """Plays back a fixed sequence of Controls, one per poll"""
+
+    def __init__(self, script, loop=True):
+        self.script = list(script)
+        self.loop = loop
+        self.index = 0
+
+    def poll(self):
+        if self.index >= len(self.script):
+            if not self.loop or not self.script:
+                return Controls()
+            self.index = 0
+
+        controls = self.script[self.index]
+        self.index += 1
+        return controls
+
+
+class RandomPilot:
+    """Mashes random controls, holding each combination for a random number of polls.
+
+    Uses its own random stream, so the pilot's choices never take draws
+    from the world's rng.
+    """
+
+    def __init__(self, seed=None, min_hold=5, max_hold=40):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.controls = Controls()
+        self.hold = 0
+
+    def poll(self):
+        if self.hold <= 0:
+            rng = self.rng
+            turn = rng.random()
+            self.controls = Controls(
+                left=turn < 0.3,
+                right=turn > 0.7,
+                thrust=rng.random() < 0.4,
+                reverse=rng.random() < 0.1,
+                shoot=rng.random() < 0.7,
+            )
+            self.hold = rng.randint(self.min_hold, self.max_hold)
+        self.hold -= 1
+        return self.controls
@@ -0,0 +1,205 @@
+import numpy as np
+import pygame
+
+from asteroid import Asteroid
+from shot import Shot
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class EntityStore:
+    """Structure-of-arrays storage for moving circle shapes.
+
+    Rows are kept packed in [0, count) and removed with swap-remove, so a
+    whole store is integrated, wrapped and expired with a handful of NumPy
+    operations per frame instead of one Python call per sprite.
+    """
+
+    def __init__(self, capacity=1024, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.count = 0
+        self.owners = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old_count = self.count
+        position = np.zeros((capacity, 2))
+        velocity = np.zeros((capacity, 2))
+        radius = np.zeros(capacity)
+        lifetime = np.full(capacity, np.inf)
+        damping = np.ones(capacity)
+        wraps = np.zeros(capacity, dtype=bool)
+
+        if old_count:
+            position[:old_count] = self.position[:old_count]
+            velocity[:old_count] = self.velocity[:old_count]
+            radius[:old_count] = self.radius[:old_count]
+            lifetime[:old_count] = self.lifetime[:old_count]
+            damping[:old_count] = self.damping[:old_count]
+            wraps[:old_count] = self.wraps[:old_count]
+
+        self.position = position
+        self.velocity = velocity
+        self.radius = radius
+        self.lifetime = lifetime
+        self.damping = damping
+        self.wraps = wraps
+        self.capacity = capacity
+
+    def add(self, owner):
+        """Reserve a row for owner and return its slot"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.count += 1
+        self.position[slot] = 0
+        self.velocity[slot] = 0
+        self.radius[slot] = 0
+        self.lifetime[slot] = np.inf
+        self.damping[slot] = owner.damping
+        self.wraps[slot] = owner.wraps
+        self.owners.append(owner)
+        return slot
+
+    def remove(self, slot):
+        """Free a row by moving the last row into it"""
+        last = self.count - 1
+        if slot != last:
+            self.position[slot] = self.position[last]
+            self.velocity[slot] = self.velocity[last]
+            self.radius[slot] = self.radius[last]
+            self.lifetime[slot] = self.lifetime[last]
+            self.damping[slot] = self.damping[last]
+            self.wraps[slot] = self.wraps[last]
+            moved = self.owners[last]
+            moved.slot = slot
+            self.owners[slot] = moved
+        self.owners.pop()
+        self.count = last
+
+    def clear(self):
+        """Free every row at once"""
+        for owner in self.owners:
+            owner.slot = -1
+        self.owners.clear()
+        self.count = 0
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+
+        position = self.position[:n]
+        velocity = self.velocity[:n]
+        radius = self.radius[:n]
+        wraps = self.wraps[:n]
+
+        position += velocity * dt
+
+        # Same rules as CircleShape.wrap_screen, applied to wrapping rows only
+        x = position[:, 0]
+        y = position[:, 1]
+        left = wraps & (x < -radius)
+        right = wraps & (x > self.width + radius)
+        top = wraps & (y < -radius)
+        bottom = wraps & (y > self.height + radius)
+        x[left] = self.width + radius[left]
+        x[right] = -radius[right]
+        y[top] = self.height + radius[top]
+        y[bottom] = -radius[bottom]
+
+        lifetime = self.lifetime[:n]
+        lifetime -= dt
+        velocity *= self.damping[:n, None]
+
+        # Rows that don't wrap can never come back once they leave the screen
+        off_screen = ~wraps & (
+            (x < -radius) | (x > self.width + radius) |
+            (y < -radius) | (y > self.height + radius)
+        )
+
+        expired = np.flatnonzero((lifetime <= 0) | off_screen)
+        if len(expired):
+            # Killing swaps rows around, so resolve owners before removing any.
+            # expire() rather than kill(), so the world can kill them in registry order
+            for owner in [self.owners[i] for i in expired]:
+                owner.expire()
+
+
+class StoredEntity:
+    """Mixin that keeps a sprite's motion state in an EntityStore row.
+
+    Reading position or velocity returns a fresh Vector2, so in-place edits
+    like `entity.position.x = 0` are lost; assign the whole vector instead.
+    The store does all integration, so update() is a no-op.
+    """
+
+    store = None
+    wraps = True
+    damping = 1.0
+    slot = -1
+
+    def _row(self):
+        if self.slot < 0:
+            self.slot = self.store.add(self)
+        return self.slot
+
+    @property
+    def position(self):
+        slot = self._row()
+        x, y = self.store.position[slot]
+        return pygame.Vector2(x, y)
+
+    @position.setter
+    def position(self, value):
+        slot = self._row()  # May grow the store, so look up the array afterwards
+        self.store.position[slot] = (value[0], value[1])
+
+    @property
+    def velocity(self):
+        slot = self._row()
+        x, y = self.store.velocity[slot]
+        return pygame.Vector2(x, y)
+
+    @velocity.setter
+    def velocity(self, value):
+        slot = self._row()
+        self.store.velocity[slot] = (value[0], value[1])
+
+    @property
+    def radius(self):
+        slot = self._row()
+        return float(self.store.radius[slot])
+
+    @radius.setter
+    def radius(self, value):
+        slot = self._row()
+        self.store.radius[slot] = value
+
+    @property
+    def lifetime(self):
+        slot = self._row()
+        return float(self.store.lifetime[slot])
+
+    @lifetime.setter
+    def lifetime(self, value):
+        slot = self._row()
+        self.store.lifetime[slot] = value
+
+    def update(self, dt):
+        pass
+
+    def kill(self):
+        if self.slot >= 0:
+            self.store.remove(self.slot)
+            self.slot = -1
+        super().kill()
+
+
+class StoredAsteroid(StoredEntity, Asteroid):
+    pass
+
+
+class StoredShot(StoredEntity, Shot):
+    wraps = False
@@ -1,51 +1,22 @@
 import pygame
 import random
-import math
 
-from circleshape import CircleShape
-
-class Particle(CircleShape):
-    def __init__(self, x, y):
-        super().__init__(x, y, 2)
-        self.lifetime = random.uniform(1.0, 2.0)
-        self.max_lifetime = self.lifetime
-        
-        # Random velocity for explosion effect
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(50, 150)
-        self.velocity = pygame.Vector2(math.cos(angle), math.sin(angle)) * speed
-        
-    def update(self, dt):
-        self.position += self.velocity * dt
-        self.lifetime -= dt
-        
-        # Slow down over time
-        self.velocity *= 0.98
-        
-        if self.lifetime <= 0:
-            self.kill()
-    
-    def draw(self, screen):
-        # Fade out as lifetime decreases
-        alpha = max(0, self.lifetime / self.max_lifetime)
-        color_value = max(0, min(255, int(255 * alpha)))
-        color = (color_value, color_value, color_value)
-        pygame.draw.circle(screen, color, (int(self.position.x), int(self.position.y)), int(self.radius))
 
 class PlayerExplosion:
+    __slots__ = ("position", "rotation", "rotation_speed", "scale", "lifetime", "max_lifetime")
+    particles = None  # Shared ParticleEngine, set in create_world()
+    rng = random  # Per-game random.Random stream, set in create_world()
+
     def __init__(self, x, y, rotation):
         self.position = pygame.Vector2(x, y)
         self.rotation = rotation
-        self.rotation_speed = random.uniform(300, 600)
+        self.rotation_speed = self.rng.uniform(300, 600)
         self.scale = 1.0
         self.lifetime = 1.5
         self.max_lifetime = self.lifetime
-        self.particles = pygame.sprite.Group()
         
         # Create explosion particles
-        for _ in range(15):
-            particle = Particle(x, y)
-            self.particles.add(particle)
+        self.particles.emit(x, y, 15, "player", max_age=self.lifetime)
     
     def update(self, dt):
         self.lifetime -= dt
@@ -53,8 +24,6 @@ class PlayerExplosion:
         self.scale -= dt * 1.5  # Shrink to a point
         self.scale = max(0, self.scale)  # Don't go negative
         
-        self.particles.update(dt)
-        
         return self.lifetime > 0
     
     def draw(self, screen):
@@ -70,34 +39,28 @@ class PlayerExplosion:
             
             color_value = max(0, min(255, int(255 * alpha)))
             color = (color_value, color_value, color_value)
-            pygame.draw.polygon(screen, color, [a, b, c], 2)
-        
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(screen)
+            return pygame.draw.polygon(screen, color, [a, b, c], 2)
+        return None
 
 class AsteroidExplosion:
+    __slots__ = ("position", "lifetime", "max_lifetime")
+    particles = None  # Shared ParticleEngine, set in create_world()
+
     def __init__(self, x, y, radius):
         self.position = pygame.Vector2(x, y)
         self.lifetime = 0.8
         self.max_lifetime = self.lifetime
-        self.particles = pygame.sprite.Group()
         
         # Create explosion particles based on asteroid size
         particle_count = max(5, min(15, int(radius / 3)))
-        for _ in range(particle_count):
-            particle = Particle(x, y)
-            # Scale particle speed based on asteroid size
-            speed_multiplier = min(2.0, radius / 20)
-            particle.velocity *= speed_multiplier
-            self.particles.add(particle)
+        # Scale particle speed based on asteroid size
+        speed_multiplier = min(2.0, radius / 20)
+        self.particles.emit(x, y, particle_count, "asteroid", speed_multiplier, max_age=self.lifetime)
     
     def update(self, dt):
         self.lifetime -= dt
-        self.particles.update(dt)
         return self.lifetime > 0
     
     def draw(self, screen):
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(screen)
\ No newline at end of file
+        # Particles are drawn in one batch by the ParticleEngine
+        return None
@@ -1,6 +1,24 @@
 import pygame
+import random
 from abc import ABC, abstractmethod
-from constants import *
+from config import default_config
+from spatialhash import SpatialHash
+from sweep import swept_hits
+from weapons import guide
+from narrowphase import (ship_hits_asteroid, ship_hits_circle, asteroid_hits_circle,
+                         shot_hits_asteroid, ray_hits_asteroid)
+from textcache import text_cache, GlyphAtlas
+from renderer import CachedLayer, TextLayer
+from profiler import profiler
+from snapshot import clear_world
+
+
+def draw_each(screen, items, rects):
+    """Draw every item, collecting the rects they report into rects"""
+    for item in items:
+        rect = item.draw(screen)
+        if rect:
+            rects.append(rect)
 
 
 class GameState(ABC):
@@ -21,9 +39,13 @@ class GameState(ABC):
     
     @abstractmethod
     def draw(self, screen):
-        """Draw the current state to screen"""
+        """Draw the current state to screen and return the list of rects drawn"""
         pass
     
+    def is_static(self):
+        """True while nothing on screen changes, so the renderer can skip frames"""
+        return False
+    
     def enter(self):
         """Called when entering this state"""
         pass
@@ -36,10 +58,12 @@ class GameState(ABC):
 class StartState(GameState):
     """Start screen state"""
     
-    def __init__(self, state_machine, font, title_font):
+    def __init__(self, state_machine, font, title_font, config=default_config):
         super().__init__(state_machine)
         self.font = font
         self.title_font = title_font
+        self.config = config
+        self.menu = TextLayer()
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -52,52 +76,69 @@ class StartState(GameState):
     def update(self, dt):
         pass
     
+    def is_static(self):
+        return True
+    
     def draw(self, screen):
-        # Draw title
-        title_text = self.title_font.render("ASTEROIDS", True, "white")
-        title_rect = title_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 100))
-        screen.blit(title_text, title_rect)
-        
-        # Draw start option
-        start_text = self.font.render("Press SPACE to Start", True, "white")
-        start_rect = start_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
-        screen.blit(start_text, start_rect)
-        
-        # Draw quit option
-        quit_text = self.font.render("Press Q to Quit", True, "white")
-        quit_rect = quit_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 60))
-        screen.blit(quit_text, quit_rect)
+        cx, cy = self.config.screen_width / 2, self.config.screen_height / 2
+        
+        # Title, start option and quit option
+        return [self.menu.draw(screen, (
+            (self.title_font, "ASTEROIDS", (cx, cy - 100)),
+            (self.font, "Press SPACE to Start", (cx, cy)),
+            (self.font, "Press Q to Quit", (cx, cy + 60)),
+        ))]
 
 
 class PlayingState(GameState):
     """Main gameplay state"""
     
-    def __init__(self, state_machine, game_objects):
+    def __init__(self, state_machine, world):
         super().__init__(state_machine)
-        self.game_objects = game_objects
+        self.world = world
+        self.config = world.config
         self.paused = False
+        
+        # Broadphase grids, rebuilt every frame
+        self.asteroid_grid = SpatialHash(self.config.spatial_hash_cell_size)
+        self.shot_grid = SpatialHash(self.config.spatial_hash_cell_size)
+        self.powerup_grid = SpatialHash(self.config.spatial_hash_cell_size)
+        self.asteroid_grid_current = False  # Whether asteroid_grid holds this tick's asteroids
+        
+        # Built on first draw so headless runs never need a font
+        self.score_digits = None
+        self.hud = CachedLayer((0, 0, self.config.screen_width, 50), self._paint_hud)
+        self.pause_overlay = TextLayer()
     
     def enter(self):
+        # Every game gets its own random stream so it can be replayed
+        seed = self.world.seed
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.world.game_seed = seed
+        self.world.rng.seed(seed)
+        self.world.particles.seed(seed)
+        if self.world.recorder:
+            self.world.recorder.start(seed, self.world.timestep, self.config)
+        
         # Initialize/reset game state
-        self.game_objects['lives'] = PLAYER_LIVES
-        self.game_objects['respawn_timer'] = 0
-        self.game_objects['player'] = self.game_objects['spawn_player']()
-        self.game_objects['explosion'] = None
+        self.world.lives = self.config.player_lives
+        self.world.respawn_timer = 0
+        self.world.explosion = None
         self.paused = False
-        self.game_objects['score'] = 0
-        self.game_objects['score_animations'] = []
-        self.game_objects['asteroid_explosions'] = []
+        self.world.score = 0
+        self.world.asteroids_destroyed = 0
+        self.world.shields_used = 0
         
-        # Clear existing objects
-        for asteroid in self.game_objects['asteroids']:
-            asteroid.kill()
-        for shot in self.game_objects['shots']:
-            shot.kill()
-        for powerup in self.game_objects['powerups']:
-            powerup.kill()
+        # Empty the world left over from the previous game in one sweep
+        clear_world(self.world)
         
-        # Create asteroid field
-        self.game_objects['AsteroidField']()
+        self.world.player = self.world.spawn_player()
+        self.world.asteroid_field = self.world.AsteroidField()
+    
+    def exit(self):
+        if self.world.recorder:
+            self.world.recorder.stop(self.world)
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -106,154 +147,295 @@ class PlayingState(GameState):
         return True
     
     def update(self, dt):
-        if not self.paused:
-            self.game_objects['updatable'].update(dt)
-            
-            # Update score animations
-            for animation in self.game_objects['score_animations'][:]:
-                animation.update(dt)
-                if animation.lifetime <= 0:
-                    self.game_objects['score_animations'].remove(animation)
-            
-            # Update asteroid explosions
-            for explosion in self.game_objects['asteroid_explosions'][:]:
-                explosion.update(dt)
-                if explosion.lifetime <= 0:
-                    self.game_objects['asteroid_explosions'].remove(explosion)
+        if self.paused:
+            return
+        
+        if self.world.recorder:
+            self.world.recorder.tick()
+        
+        with profiler.section("update.entities"):
+            self.update_entities(dt)
+        with profiler.section("update.effects"):
+            self.update_effects(dt)
+        
+        with profiler.section("collide.player"):
+            self.collide_player()
+        # Bombs, beams and missiles share the asteroid grid, so they go before the swept shots rebuild it
+        with profiler.section("collide.powerups"):
+            self.collide_powerups()
+        with profiler.section("collide.weapons"):
+            self.collide_weapons(dt)
+        with profiler.section("collide.shots"):
+            self.collide_shots(dt)
+        # Asteroids split or spawned this tick, as many as the budget allows
+        with profiler.section("update.spawn"):
+            self.world.spawner.update()
+        
+        # Handle explosion
+        if self.world.explosion:
+            if not self.world.explosion.update(dt):
+                self.world.explosion = None
+                if self.world.lives <= 0:
+                    self.state_machine.change_state('game_over')
+        
+        # Handle respawning
+        if self.world.respawn_timer > 0:
+            self.world.respawn_timer -= dt
+            if (self.world.respawn_timer <= 0 and 
+                not self.world.explosion):
+                self.world.player = self.world.spawn_player()
+    
+    def update_entities(self, dt):
+        # End timed power-ups first, so the player moves without them this tick
+        self.world.effects.update(dt)
+        if self.world.entity_store:
+            self.world.entity_store.update(dt)
+        self.world.updatable.update(dt)
+        
+        # The update order isn't kept by save states but bag order is, so kill by that
+        expired = self.world.expired
+        if expired:
+            self.world.registry.kill_in_order(expired)
+            expired.clear()
+    
+    def update_effects(self, dt):
+        # Update score animations, dropping finished ones
+        self.world.score_animations.retain(lambda animation: animation.update(dt))
+        
+        # Update asteroid explosions and all their particles
+        self.world.particles.update(dt)
+        self.world.asteroid_explosions.retain(lambda explosion: explosion.update(dt))
+        self.world.beams.retain(lambda beam: beam.update(dt))
+    
+    def nearby_asteroids(self):
+        """SpatialHash of this tick's asteroids, built on first use"""
+        if not self.asteroid_grid_current:
+            self.asteroid_grid.build(self.world.asteroids)
+            self.asteroid_grid_current = True
+        return self.asteroid_grid
+    
+    def collide_player(self):
+        """Collision detection - player vs asteroids (including shield)"""
+        # First collision pass of the tick; everything has moved since the grid was built
+        self.asteroid_grid_current = False
+        if (not self.world.player or 
+            self.world.respawn_timer > 0 or 
+            self.world.explosion):
+            return
+        
+        player = self.world.player
+        
+        # Only asteroids near the player (or its shield) can hit it
+        reach = player.radius + 15 if player.has_shield() else player.hit_radius
+        
+        for asteroid in self.nearby_asteroids().query(player.position, reach):
+            hit_shield = False
             
-            # Collision detection - player vs asteroids (including shield)
-            if (self.game_objects['player'] and 
-                self.game_objects['respawn_timer'] <= 0 and 
-                not self.game_objects['explosion']):
-                
-                player = self.game_objects['player']
-                
-                for asteroid in self.game_objects['asteroids']:
-                    hit_shield = False
+            # Check shield collision first (if player has active shield)
+            if player.has_shield():
+                shield_radius = player.radius + 15  # Same as shield visual radius
+                if asteroid_hits_circle(asteroid, player.position, shield_radius):
+                    # Shield was hit
+                    hit_shield = True
+                    player.take_damage()  # This will disable the shield
+                    self.world.shields_used += 1
+                    self.world.asteroids_destroyed += 1
                     
-                    # Check shield collision first (if player has active shield)
-                    if player.has_shield():
-                        shield_radius = player.radius + 15  # Same as shield visual radius
-                        distance = (asteroid.position - player.position).length()
-                        if distance <= (asteroid.radius + shield_radius):
-                            # Shield was hit
-                            hit_shield = True
-                            player.take_damage()  # This will disable the shield
-                            
-                            # Asteroid disappears completely (no splitting)
-                            self.game_objects['asteroid_explosions'].append(
-                                self.game_objects['create_explosion'](asteroid.position)
-                            )
-                            asteroid.kill()  # Just kill, don't split
-                            break
-                    
-                    # Check player collision only if shield wasn't hit
-                    if not hit_shield and asteroid.colliding_with(player):
-                        # Player takes direct damage (no shield protection)
-                        from explosion import PlayerExplosion
-                        self.game_objects['explosion'] = PlayerExplosion(
-                            player.position.x, 
-                            player.position.y, 
-                            player.rotation
-                        )
-                        player.kill()
-                        self.game_objects['player'] = None
-                        self.game_objects['lives'] -= 1
-                        self.game_objects['respawn_timer'] = RESPAWN_TIME
-                        
-                        # Clear screen
-                        for ast in self.game_objects['asteroids']:
-                            ast.kill()
-                        for shot in self.game_objects['shots']:
-                            shot.kill()
-                        break
-            
-            # Collision detection - shots vs asteroids
-            for asteroid in self.game_objects['asteroids']:
-                for shot in self.game_objects['shots']:
-                    if asteroid.colliding_with(shot):
-                        self.game_objects['score'] += 100
-                        self.game_objects['score_animations'].append(
-                            self.game_objects['ScoreAnimation'](asteroid.position.x, asteroid.position.y, "+100")
-                        )
-                        self.game_objects['asteroid_explosions'].append(
-                            self.game_objects['create_explosion'](asteroid.position)
-                        )
-                        asteroid.split()
-                        shot.kill()
-                        break
+                    # Asteroid disappears completely (no splitting)
+                    self.world.asteroid_explosions.add(
+                        self.world.create_explosion(asteroid.position)
+                    )
+                    asteroid.kill()  # Just kill, don't split
+                    break
             
-            # Collision detection - player vs power-ups
-            if self.game_objects['player']:
-                for powerup in list(self.game_objects['powerups']):  # Convert to list to avoid modification during iteration
-                    if powerup.colliding_with(self.game_objects['player']):
-                        # Try to apply power-up to player
-                        if powerup.apply_to_player(self.game_objects['player']):
-                            # Power-up was successfully applied
-                            powerup.kill()
-                        # If power-up was ignored (e.g., player already has shield), leave it for potential future pickup
-            
-            # Handle explosion
-            if self.game_objects['explosion']:
-                if not self.game_objects['explosion'].update(dt):
-                    self.game_objects['explosion'] = None
-                    if self.game_objects['lives'] <= 0:
-                        self.state_machine.change_state('game_over')
-            
-            # Handle respawning
-            if self.game_objects['respawn_timer'] > 0:
-                self.game_objects['respawn_timer'] -= dt
-                if (self.game_objects['respawn_timer'] <= 0 and 
-                    not self.game_objects['explosion']):
-                    self.game_objects['player'] = self.game_objects['spawn_player']()
+            # Check player collision only if shield wasn't hit
+            if not hit_shield and ship_hits_asteroid(player, asteroid):
+                # Player takes direct damage (no shield protection)
+                self.world.explosion = self.world.PlayerExplosion(
+                    player.position.x, 
+                    player.position.y, 
+                    player.rotation
+                )
+                player.kill()
+                self.world.player = None
+                self.world.lives -= 1
+                self.world.respawn_timer = self.config.respawn_time
+                
+                # Clear screen, including asteroids still waiting to be built
+                self.world.registry.kill_all('asteroid')
+                self.world.registry.kill_all('shot')
+                self.world.spawner.clear()
+                break
     
-    def draw(self, screen):
-        # Draw game objects
-        for d in self.game_objects['drawable']:
-            d.draw(screen)
+    def collide_shots(self, dt):
+        """Collision detection - shots vs asteroids"""
+        if self.config.swept_collisions:
+            self.collide_shots_swept(dt)
+            return
         
-        # Draw explosion if active
-        if self.game_objects['explosion']:
-            self.game_objects['explosion'].draw(screen)
+        self.shot_grid.build(self.world.shots)
+        # Splitting adds and removes asteroids, so walk a snapshot
+        for asteroid in list(self.world.asteroids):
+            for shot in self.shot_grid.query(asteroid.position, asteroid.hit_radius):
+                # Skip shots already used up by another asteroid
+                if shot.alive() and asteroid_hits_circle(asteroid, shot.position, shot.radius):
+                    self.shot_hit(shot, asteroid)
+                    break
+    
+    def collide_shots_swept(self, dt):
+        """Shots vs asteroids along their motion this tick, earliest impact first"""
+        lifetime = self.config.shot_lifetime
+        age = lambda shot: lifetime - shot.lifetime
+        hits = swept_hits(list(self.world.shots), list(self.world.asteroids),
+                          self.asteroid_grid, dt, age)
+        # swept_hits may have refilled the grid with its own entries
+        self.asteroid_grid_current = False
+        for _, shot, asteroid in hits:
+            # Each shot and asteroid only counts for its earliest hit; the
+            # sweep only tested their bounding circles, so check the outline too
+            if (shot.alive() and asteroid.alive() and
+                    shot_hits_asteroid(shot, asteroid, max(0.0, min(dt, age(shot))), dt)):
+                self.shot_hit(shot, asteroid)
+    
+    def shot_hit(self, shot, asteroid):
+        self.asteroid_hit(asteroid)
+        shot.kill()
+    
+    def asteroid_hit(self, asteroid):
+        """Score an asteroid destroyed by the player's weapons and split it"""
+        self.world.score += 100
+        self.world.asteroids_destroyed += 1
+        self.world.score_animations.add(
+            self.world.ScoreAnimation(asteroid.position.x, asteroid.position.y, "+100")
+        )
+        self.world.asteroid_explosions.add(
+            self.world.create_explosion(asteroid.position)
+        )
+        asteroid.split()
+    
+    def collide_powerups(self):
+        """Collision detection - player vs power-ups"""
+        if not self.world.player:
+            return
         
-        # Draw asteroid explosions
-        for explosion in self.game_objects['asteroid_explosions']:
-            explosion.draw(screen)
+        player = self.world.player
+        self.powerup_grid.build(self.world.powerups)
+        for powerup in self.powerup_grid.query(player.position, player.hit_radius):
+            if not ship_hits_circle(player, powerup):
+                continue
+            # Try to apply power-up to player
+            if powerup.effect.apply(self, player):
+                # Power-up was successfully applied
+                powerup.kill()
+            # If power-up was ignored (e.g., player already has shield), leave it for potential future pickup
+    
+    def detonate(self, position, radius):
+        """Destroy every asteroid within radius of position; returns how many.
         
-        # Draw score animations
-        for animation in self.game_objects['score_animations']:
-            animation.draw(screen)
+        Only asteroids in nearby grid cells are tested. Asteroids killed
+        since the grid was built this tick are skipped.
+        """
+        destroyed = 0
+        for asteroid in self.nearby_asteroids().query(position, radius):
+            if asteroid.alive() and asteroid_hits_circle(asteroid, position, radius):
+                self.world.asteroid_explosions.add(
+                    self.world.create_explosion(asteroid.position)
+                )
+                asteroid.kill()  # Like a shield hit, no splitting
+                destroyed += 1
+        self.world.asteroids_destroyed += destroyed
+        return destroyed
+    
+    def collide_weapons(self, dt):
+        """Resolve new laser beams and steer homing missiles, using the asteroid grid"""
+        alive = lambda asteroid: asteroid.alive()
+        
+        for beam in self.world.beams:
+            if beam.resolved:
+                continue
+            beam.resolved = True
+            start, direction = beam.start, beam.direction
+            end = beam.end
+            # The first asteroid along the ray takes the hit and stops the beam
+            hit = None
+            for asteroid in self.nearby_asteroids().query_segment(start.x, start.y, end.x, end.y):
+                if asteroid.alive():
+                    distance = ray_hits_asteroid(start, direction, asteroid)
+                    if distance is not None and distance < beam.length:
+                        beam.length = distance
+                        hit = asteroid
+            if hit:
+                self.asteroid_hit(hit)
+        
+        for shot in self.world.shots:
+            if not shot.homing:
+                continue
+            if shot.target is None or not shot.target.alive():
+                shot.target = self.nearby_asteroids().nearest(shot.position.x, shot.position.y, accept=alive)
+                if shot.target is None:
+                    continue
+            guide(shot, dt)
+    
+    def is_static(self):
+        return self.paused
+    
+    def _paint_hud(self, surface, key):
+        lives, score = key
         
         # Draw heart icon and lives count
-        self.game_objects['draw_heart'](screen, 10, 15, 24)
-        lives_text = self.game_objects['font'].render(f"x{self.game_objects['lives']}", True, "white")
-        screen.blit(lives_text, (40, 10))
+        self.world.draw_heart(surface, 10, 15, 24)
+        lives_text = text_cache.render(self.world.font, f"x{lives}")
+        surface.blit(lives_text, (40, 10))
         
-        # Draw score
-        score_text = self.game_objects['font'].render(f"{self.game_objects['score']:06d}", True, "white")
-        score_rect = score_text.get_rect()
-        score_rect.topright = (SCREEN_WIDTH - 10, 10)
-        screen.blit(score_text, score_rect)
+        # Draw score from pre-rendered digits, it changes too often to cache whole strings
+        if self.score_digits is None:
+            self.score_digits = GlyphAtlas(self.world.font)
+        self.score_digits.draw(surface, f"{score:06d}", topright=(self.config.screen_width - 10, 10))
+    
+    def draw(self, screen):
+        rects = []
         
-        # Draw pause screen
-        if self.paused:
-            pause_text = self.game_objects['font'].render("PAUSED", True, "white")
-            pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 20))
-            screen.blit(pause_text, pause_rect)
+        # Draw game objects
+        with profiler.section("draw.entities"):
+            draw_each(screen, self.world.drawable, rects)
+        
+        with profiler.section("draw.effects"):
+            # Draw explosion if active
+            if self.world.explosion:
+                draw_each(screen, (self.world.explosion,), rects)
             
-            resume_text = self.game_objects['font'].render("Press ESC to Resume", True, "white")
-            resume_rect = resume_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 20))
-            screen.blit(resume_text, resume_rect)
+            # Draw asteroid explosions and laser beams
+            draw_each(screen, self.world.asteroid_explosions, rects)
+            draw_each(screen, (self.world.particles,), rects)
+            draw_each(screen, self.world.beams, rects)
+            
+            # Draw score animations
+            draw_each(screen, self.world.score_animations, rects)
+        
+        with profiler.section("draw.hud"):
+            # Lives and score only repaint when they change
+            rects.append(self.hud.draw(screen, (self.world.lives, self.world.score)))
+            
+            # Draw pause screen
+            if self.paused:
+                cx, cy = self.config.screen_width / 2, self.config.screen_height / 2
+                rects.append(self.pause_overlay.draw(screen, (
+                    (self.world.font, "PAUSED", (cx, cy - 20)),
+                    (self.world.font, "Press ESC to Resume", (cx, cy + 20)),
+                )))
+        
+        return rects
 
 
 class GameOverState(GameState):
     """Game over state"""
     
-    def __init__(self, state_machine, game_objects, font, title_font):
+    def __init__(self, state_machine, world, font, title_font):
         super().__init__(state_machine)
-        self.game_objects = game_objects
+        self.world = world
         self.font = font
         self.title_font = title_font
+        self.text = TextLayer()
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -265,58 +447,53 @@ class GameOverState(GameState):
     
     def update(self, dt):
         # Update explosions and score animations
-        for animation in self.game_objects['score_animations'][:]:
-            animation.update(dt)
-            if animation.lifetime <= 0:
-                self.game_objects['score_animations'].remove(animation)
+        self.world.particles.update(dt)
+        self.world.score_animations.retain(lambda animation: animation.update(dt))
+        self.world.asteroid_explosions.retain(lambda explosion: explosion.update(dt))
+        self.world.beams.retain(lambda beam: beam.update(dt))
         
-        for explosion in self.game_objects['asteroid_explosions'][:]:
-            explosion.update(dt)
-            if explosion.lifetime <= 0:
-                self.game_objects['asteroid_explosions'].remove(explosion)
-        
-        if self.game_objects['explosion']:
-            self.game_objects['explosion'].update(dt)
-            if self.game_objects['explosion'].lifetime <= 0:
-                self.game_objects['explosion'] = None
+        if self.world.explosion:
+            self.world.explosion.update(dt)
+            if self.world.explosion.lifetime <= 0:
+                self.world.explosion = None
+    
+    def is_static(self):
+        return (not self.world.explosion and
+                not self.world.asteroid_explosions and
+                not self.world.beams and
+                not self.world.score_animations and
+                not self.world.particles.live_count())
     
     def draw(self, screen):
+        rects = []
+        
         # Draw remaining game objects without player
-        for d in self.game_objects['drawable']:
-            if not hasattr(d, 'rotation'):  # Player has rotation attribute
-                d.draw(screen)
+        players = self.world.registry['player']
+        draw_each(screen, (d for d in self.world.drawable if d not in players), rects)
         
         # Draw explosion if active
-        if self.game_objects['explosion']:
-            self.game_objects['explosion'].draw(screen)
+        if self.world.explosion:
+            draw_each(screen, (self.world.explosion,), rects)
         
-        # Draw asteroid explosions
-        for explosion in self.game_objects['asteroid_explosions']:
-            explosion.draw(screen)
+        # Draw asteroid explosions and laser beams
+        draw_each(screen, self.world.asteroid_explosions, rects)
+        draw_each(screen, (self.world.particles,), rects)
+        draw_each(screen, self.world.beams, rects)
         
         # Draw score animations
-        for animation in self.game_objects['score_animations']:
-            animation.draw(screen)
-        
-        # Draw game over screen
-        game_over_text = self.title_font.render("GAME OVER", True, "white")
-        text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 80))
-        screen.blit(game_over_text, text_rect)
-        
-        # Draw final score
-        final_score_text = self.font.render(f"Final Score: {self.game_objects['score']:06d}", True, "white")
-        score_rect = final_score_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 20))
-        screen.blit(final_score_text, score_rect)
-        
-        # Draw retry option
-        retry_text = self.font.render("Press R to Retry", True, "white")
-        retry_rect = retry_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 20))
-        screen.blit(retry_text, retry_rect)
-        
-        # Draw quit option
-        quit_text = self.font.render("Press Q to Quit", True, "white")
-        quit_rect = quit_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 60))
-        screen.blit(quit_text, quit_rect)
+        draw_each(screen, self.world.score_animations, rects)
+        
+        # Game over title, final score, retry and quit options
+        config = self.world.config
+        cx, cy = config.screen_width / 2, config.screen_height / 2
+        rects.append(self.text.draw(screen, (
+            (self.title_font, "GAME OVER", (cx, cy - 80)),
+            (self.font, f"Final Score: {self.world.score:06d}", (cx, cy - 20)),
+            (self.font, "Press R to Retry", (cx, cy + 20)),
+            (self.font, "Press Q to Quit", (cx, cy + 60)),
+        )))
+        
+        return rects
 
 
 class GameStateMachine:
@@ -355,6 +532,7 @@ class GameStateMachine:
             self.current_state.update(dt)
     
     def draw(self, screen):
-        """Draw the current state"""
+        """Draw the current state and return the rects it drew"""
         if self.current_state:
-            self.current_state.draw(screen)
\ No newline at end of file
+            return self.current_state.draw(screen)
+        return []
\ No newline at end of file
@@ -0,0 +1,60 @@
+import pygame
+
+from textcache import text_cache
+
+
+# Heart pattern (8x8 grid)
+HEART_PATTERN = [
+    [0,1,1,0,0,1,1,0],
+    [1,1,1,1,1,1,1,1],
+    [1,1,1,1,1,1,1,1],
+    [1,1,1,1,1,1,1,1],
+    [0,1,1,1,1,1,1,0],
+    [0,0,1,1,1,1,0,0],
+    [0,0,0,1,1,0,0,0],
+    [0,0,0,0,0,0,0,0]
+]
+
+
+def draw_heart(surface, x, y, size=16):
+    # Draw a simple pixel-art heart
+    heart_color = "white"
+    pixel_size = size // 8
+    rect = pygame.Rect(x, y, pixel_size * 8, pixel_size * 8)
+
+    for row in range(8):
+        for col in range(8):
+            if HEART_PATTERN[row][col]:
+                pygame.draw.rect(surface, heart_color,
+                                 (x + col * pixel_size, y + row * pixel_size, pixel_size, pixel_size))
+    return rect
+
+
+class ScoreAnimation:
+    """Floating score text that rises and fades out"""
+
+    __slots__ = ("text", "x", "y", "lifetime", "max_lifetime")
+    font = None  # Set in create_world(); only needed for drawing
+
+    def __init__(self, x, y, text):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.lifetime = 1.0
+        self.max_lifetime = 1.0
+
+    def update(self, dt):
+        self.lifetime -= dt
+        self.y -= 50 * dt  # Move up
+        return self.lifetime > 0
+
+    def draw(self, screen):
+        if self.lifetime > 0:
+            alpha = self.lifetime / self.max_lifetime
+            alpha_value = max(0, min(255, int(255 * alpha)))
+
+            # The cached surface is shared, so set its alpha right before each blit
+            text_surface = text_cache.render(self.font, self.text)
+            text_surface.set_alpha(alpha_value)
+            return screen.blit(text_surface, (self.x, self.y))
+        return None
@@ -1,140 +1,152 @@
+import time
+STARTED = time.perf_counter()  # Before the other imports, so --startup-profile counts them
+
 import pygame
-import sys
-import random
+import argparse
 
 from constants import *
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from explosion import PlayerExplosion, AsteroidExplosion
 from gamestate import GameStateMachine, StartState, PlayingState, GameOverState
-from powerup import PowerUp, ShieldPowerUp
+from simulation import create_world, FixedTimestep
+from renderer import Renderer
+from controls import KeyboardInput
+from replay import Replay, Recorder, ReplayInput
+from profiler import profiler, StartupTimer
+from textcache import FontLoader
+from spritecache import RENDER_MODES, set_render_mode, pixel_comparison
+from config import Config
+from spawner import DensityController
+
+FONT_PATH = "medodica/MedodicaRegular.otf"
+
+
+def parse_args():
+  parser = argparse.ArgumentParser(description="Asteroids")
+  parser.add_argument("--entity-store", action="store_true", help="keep asteroid and shot motion in NumPy arrays")
+  parser.add_argument("--record", metavar="PATH", help="record each game to a replay file; retries go to PATH-2, PATH-3 and so on")
+  parser.add_argument("--replay", metavar="PATH", help="play back a recorded game")
+  Config.add_arguments(parser)
+  parser.add_argument("--profile", metavar="PATH", help="time each frame phase and write the stats to a .csv or .json file on exit")
+  parser.add_argument("--render-mode", choices=RENDER_MODES, default=SPRITE_RENDER_MODE,
+                      help="draw sprites from baked surfaces or as vectors; compare prints how far baked ones differ on exit")
+  parser.add_argument("--startup-profile", action="store_true", help="print how long each startup phase took, up to the first frame")
+  return parser.parse_args()
 
 
 def main():
-  pygame.init()
-  screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-  font = pygame.font.Font("medodica/MedodicaRegular.otf", 36)
-  title_font = pygame.font.Font("medodica/MedodicaRegular.otf", 72)
-  
-  def draw_heart(surface, x, y, size=16):
-    # Draw a simple pixel-art heart
-    heart_color = "white"
-    pixel_size = size // 8
-    
-    # Heart pattern (8x8 grid)
-    heart_pattern = [
-      [0,1,1,0,0,1,1,0],
-      [1,1,1,1,1,1,1,1],
-      [1,1,1,1,1,1,1,1],
-      [1,1,1,1,1,1,1,1],
-      [0,1,1,1,1,1,1,0],
-      [0,0,1,1,1,1,0,0],
-      [0,0,0,1,1,0,0,0],
-      [0,0,0,0,0,0,0,0]
-    ]
-    
-    for row in range(8):
-      for col in range(8):
-        if heart_pattern[row][col]:
-          pygame.draw.rect(surface, heart_color, 
-                         (x + col * pixel_size, y + row * pixel_size, pixel_size, pixel_size))
-
-  updatable = pygame.sprite.Group()
-  drawable = pygame.sprite.Group()
-  asteroids = pygame.sprite.Group()
-  shots = pygame.sprite.Group()
-  powerups = pygame.sprite.Group()
-
-  Player.containers = (updatable, drawable)
-  Asteroid.containers = (asteroids, updatable, drawable)
-  AsteroidField.containers = updatable
-  Shot.containers = (shots, updatable, drawable)
-  PowerUp.containers = (powerups, updatable, drawable)
+  startup = StartupTimer(STARTED)
+  startup.mark("imports")
+  args = parse_args()
+  if args.profile:
+    profiler.enabled = True
+  set_render_mode(args.render_mode)
+  # A replay runs under the settings it was recorded with; --set still overrides them
+  replay = Replay.load(args.replay) if args.replay else None
+  config = Config.from_args(args, replay.settings if replay else None)
+  startup.mark("config")
 
-  clock = pygame.time.Clock()
-  dt = 0
+  # Only the subsystems the game uses; pygame.init() would also start audio, joysticks and so on
+  pygame.display.init()
+  pygame.font.init()
+  fonts = FontLoader(FONT_PATH, (36, 72))
+  startup.mark("pygame init")
+  screen = pygame.display.set_mode((config.screen_width, config.screen_height))
+  startup.mark("window")
+
+  recorder = Recorder(args.record, KeyboardInput()) if args.record else None
+  step = replay.step if replay else config.fixed_timestep
+
+  # Waits only if the font files are still loading
+  font = fonts.get(36)
+  title_font = fonts.get(72)
+  startup.mark("fonts")
 
-  def spawn_player():
-    return Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-  
-  def create_explosion(position):
-    return AsteroidExplosion(position.x, position.y, 30)
-  
-  class ScoreAnimation:
-    def __init__(self, x, y, text):
-      self.text = text
-      self.x = x
-      self.y = y
-      self.lifetime = 1.0
-      self.max_lifetime = 1.0
-    
-    def update(self, dt):
-      self.lifetime -= dt
-      self.y -= 50 * dt  # Move up
-      return self.lifetime > 0
-    
-    def draw(self, screen):
-      if self.lifetime > 0:
-        alpha = self.lifetime / self.max_lifetime
-        color_value = max(0, min(255, int(255 * alpha)))
-        color = (color_value, color_value, color_value)
-        
-        # Create surface with per-pixel alpha
-        text_surface = font.render(self.text, True, color)
-        screen.blit(text_surface, (self.x, self.y))
-  
   # Create game objects dictionary for state machine
-  game_objects = {
-    'updatable': updatable,
-    'drawable': drawable,
-    'asteroids': asteroids,
-    'shots': shots,
-    'powerups': powerups,
-    'lives': PLAYER_LIVES,
-    'respawn_timer': 0,
-    'player': None,
-    'explosion': None,
-    'score': 0,
-    'score_animations': [],
-    'asteroid_explosions': [],
-    'spawn_player': spawn_player,
-    'create_explosion': create_explosion,
-    'draw_heart': draw_heart,
-    'font': font,
-    'ScoreAnimation': ScoreAnimation,
-    'AsteroidField': AsteroidField
-  }
+  world = create_world(
+    font,
+    input_source=ReplayInput(replay) if replay else None,
+    use_entity_store=args.entity_store,
+    seed=replay.seed if replay else None,
+    recorder=recorder,
+    step=step,
+    config=config,
+  )
+  startup.mark("world")
+
+  # Thin out asteroids when frames run long; not while recording or replaying,
+  # since it makes the game depend on how fast this machine is
+  density = None
+  if not (replay or recorder):
+    density = world.spawner.density = DensityController(DENSITY_TARGET_FRAME_TIME, DENSITY_MIN_SCALE)
   
   # Create state machine
   state_machine = GameStateMachine()
-  state_machine.add_state('start', StartState(state_machine, font, title_font))
-  state_machine.add_state('playing', PlayingState(state_machine, game_objects))
-  state_machine.add_state('game_over', GameOverState(state_machine, game_objects, font, title_font))
+  state_machine.add_state('start', StartState(state_machine, font, title_font, config))
+  state_machine.add_state('playing', PlayingState(state_machine, world))
+  state_machine.add_state('game_over', GameOverState(state_machine, world, font, title_font))
   
-  # Start with the start state
-  state_machine.change_state('start')
+  # Start with the start state, or go straight into the game being replayed
+  state_machine.change_state('playing' if replay else 'start')
+
+  renderer = Renderer(screen)
+  clock = pygame.time.Clock()
+  timestep = FixedTimestep(step)
+  startup.mark("states")
+
+  def first_frame():
+    startup.mark("first draw")
+    if args.startup_profile:
+      print(startup.report())
+
+  try:
+    run(state_machine, renderer, clock, timestep, first_frame, density)
+  finally:
+    # Save the game in progress if the window is closed mid-game
+    if recorder:
+      recorder.stop(world)
+    if args.profile:
+      profiler.export(args.profile)
+    if args.render_mode == "compare":
+      print(pixel_comparison.report())
 
+
+def run(state_machine, renderer, clock, timestep, first_frame=None, density=None):
+  dt = 0
   while True:
-    for event in pygame.event.get():
-      if event.type == pygame.QUIT:
-        return
-      
-      # Let state machine handle events
-      if not state_machine.handle_event(event):
-        return  # State machine signaled to quit
-
-    # Update state machine
-    state_machine.update(dt)
-
-    screen.fill("black")
-    
-    # Draw current state
-    state_machine.draw(screen)
-    
-    pygame.display.flip()
+    with profiler.section("frame.events"):
+      for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+          return
+        if event.type == pygame.WINDOWEXPOSED:
+          renderer.invalidate()  # Window contents were lost, redraw everything
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+          # Timing overlay; turning it on also starts the timers
+          profiler.toggle_overlay()
+          renderer.overlay = profiler.draw_overlay if profiler.overlay_visible else None
+          renderer.invalidate()
+          continue
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+          profiler.export("profile.csv")
+          continue
+        
+        # Let state machine handle events
+        if not state_machine.handle_event(event):
+          return  # State machine signaled to quit
+
+    # Update state machine in fixed ticks, independent of the frame rate
+    with profiler.section("frame.update"):
+      for _ in range(timestep.advance(dt)):
+        state_machine.update(timestep.step)
+
+    # Draw current state, pushing only what changed to the display
+    with profiler.section("frame.draw"):
+      renderer.render(state_machine.current_state)
+    if first_frame:
+      first_frame()
+      first_frame = None
     dt = clock.tick(60) / 1000
+    if density:
+      # Time spent on the frame itself, without the wait tick() just added
+      density.record(clock.get_rawtime() / 1000)
 
 if __name__ == "__main__":
   main()
@@ -0,0 +1,175 @@
+"""Play many headless games in parallel and collect per-game results.
+
+    python montecarlo.py --games 10000 --out runs/baseline
+    python montecarlo.py --games 2000 --pilot spinner --workers 8 --out runs/spinner
+    python montecarlo.py --games 10000 --set powerup_drop_chance=0.2 --out runs/drop20
+
+Each game is one seed, run to game over (or --max-seconds) in a worker
+process. Results are streamed into one raw little-endian file per column
+plus a schema.json, so they can be loaded with numpy.fromfile or appended
+to by later runs.
+"""
+import argparse
+import array
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Config
+from controls import Controls, RandomPilot, ScriptedInput
+from simulation import Simulation
+
+# Column name and array typecode; order matches the tuples play_game returns
+COLUMNS = (
+    ('seed', 'q'),
+    ('score', 'q'),
+    ('lifetime', 'd'),
+    ('ticks', 'q'),
+    ('asteroids_destroyed', 'q'),
+    ('shields_used', 'q'),
+    ('game_over', 'b'),
+)
+DTYPES = {'q': '<i8', 'd': '<f8', 'b': '|i1'}
+
+# Turns in place and fires whenever the gun is ready
+SPINNER_SCRIPT = [Controls(right=True, shoot=True)]
+
+
+def make_pilot(name, seed):
+    if name == 'random':
+        return RandomPilot(seed)
+    if name == 'spinner':
+        return ScriptedInput(SPINNER_SCRIPT)
+    raise ValueError(f"Unknown pilot: {name}")
+
+
+def play_game(seed, pilot='random', max_ticks=None, settings=None):
+    """Run one headless game and return a row matching COLUMNS.
+
+    settings is a dict of Config overrides, which pickles more cheaply than the Config.
+    """
+    config = Config(**settings) if settings else None
+    simulation = Simulation(make_pilot(pilot, seed), seed=seed, config=config)
+    ticks = simulation.run(max_ticks if max_ticks is not None else sys.maxsize)
+    world = simulation.world
+    return (
+        seed,
+        world.score,
+        ticks * simulation.timestep.step,
+        ticks,
+        world.asteroids_destroyed,
+        world.shields_used,
+        int(simulation.game_over),
+    )
+
+
+def _play_batch(seeds, pilot, max_ticks, settings):
+    # One task per batch keeps pickling overhead low next to the games themselves
+    return [play_game(seed, pilot, max_ticks, settings) for seed in seeds]
+
+
+class ColumnWriter:
+    """Appends rows to one raw binary file per column"""
+
+    def __init__(self, directory, columns=COLUMNS):
+        self.directory = directory
+        self.columns = columns
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self.schema_path = os.path.join(directory, "schema.json")
+        if os.path.exists(self.schema_path):
+            with open(self.schema_path) as f:
+                self.rows = json.load(f)['rows']
+        self.files = [open(self._path(name), "ab") for name, _ in columns]
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + ".bin")
+
+    def write(self, rows):
+        for index, ((_, typecode), f) in enumerate(zip(self.columns, self.files)):
+            values = array.array(typecode, (row[index] for row in rows))
+            if sys.byteorder != "little":
+                values.byteswap()
+            values.tofile(f)
+        self.rows += len(rows)
+
+    def close(self, metadata=None):
+        for f in self.files:
+            f.close()
+        schema = {
+            'rows': self.rows,
+            'columns': [
+                {'name': name, 'file': name + ".bin", 'dtype': DTYPES[typecode]}
+                for name, typecode in self.columns
+            ],
+        }
+        if metadata:
+            schema['metadata'] = metadata
+        with open(self.schema_path, "w") as f:
+            json.dump(schema, f, indent=2)
+
+
+def run(games, out, first_seed=0, pilot='random', workers=None, batch_size=None, max_ticks=None, config=None):
+    """Play seeds first_seed .. first_seed + games - 1 and stream them to out; returns the summary"""
+    workers = workers or os.cpu_count()
+    config = config or Config()
+    settings = config.to_dict()
+    if batch_size is None:
+        # A few batches per worker so a slow batch doesn't leave cores idle at the end
+        batch_size = max(1, min(256, games // (workers * 8)))
+
+    seeds = range(first_seed, first_seed + games)
+    batches = [seeds[i:i + batch_size] for i in range(0, games, batch_size)]
+
+    writer = ColumnWriter(out)
+    total_score = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            count = len(batches)
+            results = executor.map(_play_batch, batches, [pilot] * count, [max_ticks] * count, [settings] * count)
+            for rows in results:
+                writer.write(rows)
+                total_score += sum(row[1] for row in rows)
+    finally:
+        elapsed = time.perf_counter() - started
+        writer.close({'pilot': pilot, 'max_ticks': max_ticks, 'config': settings})
+
+    return {
+        'games': games,
+        'workers': workers,
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed else 0.0,
+        'mean_score': total_score / games if games else 0.0,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Asteroids Monte Carlo runner")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (one seed each)")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--pilot", choices=("random", "spinner"), default="random")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--batch-size", type=int, help="games per worker task")
+    parser.add_argument("--max-seconds", type=float, default=600,
+                        help="stop a game after this much game time (default 600)")
+    Config.add_arguments(parser)
+    parser.add_argument("--out", required=True, metavar="DIR", help="directory for the column files")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = Config.from_args(args)
+    max_ticks = round(args.max_seconds / config.fixed_timestep)
+    summary = run(args.games, args.out, args.first_seed, args.pilot,
+                  args.workers, args.batch_size, max_ticks, config)
+    print(f"{summary['games']} games on {summary['workers']} workers in {summary['seconds']:.1f}s "
+          f"({summary['games_per_second']:.1f} games/s), mean score {summary['mean_score']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
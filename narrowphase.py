@@ -0,0 +1,228 @@
+"""Exact hit tests for the ship's triangle and the asteroids' lumpy outlines.
+
+Polygons are sequences of (x, y) vertices in order around their owner's
+position, convex or not, and the other shape is always given relative to
+that position. The geometry tests are only worth running on pairs that
+are already close, so each pair test below first does the cheap circle
+check on hit_radius, the bounding radius of the outline, then for
+asteroids a check against the outline's box at its rotation, and only
+then walks the edges. With the polygon_collisions setting off the circle check
+is the whole test, as it was before outlines were used.
+"""
+import math
+
+
+def _distance_sq(px, py, ax, ay, bx, by):
+    """Squared distance from a point to the segment from a to b"""
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq:
+        t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+        t = 0.0 if t < 0 else 1.0 if t > 1 else t
+        ax += t * dx
+        ay += t * dy
+    return (px - ax) ** 2 + (py - ay) ** 2
+
+
+def _side(ax, ay, bx, by, px, py):
+    return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+
+def segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+    """Whether segment ab crosses or touches segment cd"""
+    d1 = _side(cx, cy, dx, dy, ax, ay)
+    d2 = _side(cx, cy, dx, dy, bx, by)
+    d3 = _side(ax, ay, bx, by, cx, cy)
+    d4 = _side(ax, ay, bx, by, dx, dy)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    # Collinear or touching at an end point
+    return ((d1 == 0 and _distance_sq(ax, ay, cx, cy, dx, dy) == 0) or
+            (d2 == 0 and _distance_sq(bx, by, cx, cy, dx, dy) == 0) or
+            (d3 == 0 and _distance_sq(cx, cy, ax, ay, bx, by) == 0) or
+            (d4 == 0 and _distance_sq(dx, dy, ax, ay, bx, by) == 0))
+
+
+def point_in_polygon(x, y, polygon):
+    """Even-odd rule, so concave outlines work too"""
+    inside = False
+    ax, ay = polygon[-1]
+    for bx, by in polygon:
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+        ax, ay = bx, by
+    return inside
+
+
+def triangle_hits_circle(triangle, x, y, radius):
+    """Whether a circle centred at (x, y) touches the triangle"""
+    (ax, ay), (bx, by), (cx, cy) = triangle
+    # Inside when the centre is on the same side of all three edges
+    d1 = _side(ax, ay, bx, by, x, y)
+    d2 = _side(bx, by, cx, cy, x, y)
+    d3 = _side(cx, cy, ax, ay, x, y)
+    if (d1 >= 0 and d2 >= 0 and d3 >= 0) or (d1 <= 0 and d2 <= 0 and d3 <= 0):
+        return True
+    reach = radius * radius
+    return (_distance_sq(x, y, ax, ay, bx, by) <= reach or
+            _distance_sq(x, y, bx, by, cx, cy) <= reach or
+            _distance_sq(x, y, cx, cy, ax, ay) <= reach)
+
+
+def polygon_hits_circle(polygon, x, y, radius):
+    """Whether a circle centred at (x, y) touches the polygon"""
+    if point_in_polygon(x, y, polygon):
+        return True
+    reach = radius * radius
+    left, right, bottom, top = x - radius, x + radius, y - radius, y + radius
+    ax, ay = polygon[-1]
+    for bx, by in polygon:
+        # Edges wholly to one side of the circle's box can't touch it
+        if not ((ax < left and bx < left) or (ax > right and bx > right) or
+                (ay < bottom and by < bottom) or (ay > top and by > top)):
+            if _distance_sq(x, y, ax, ay, bx, by) <= reach:
+                return True
+        ax, ay = bx, by
+    return False
+
+
+def polygon_hits_capsule(polygon, x0, y0, x1, y1, radius):
+    """Whether a circle moving from (x0, y0) to (x1, y1) touches the polygon on the way"""
+    if point_in_polygon(x0, y0, polygon):
+        return True
+    reach = radius * radius
+    left, right = min(x0, x1) - radius, max(x0, x1) + radius
+    bottom, top = min(y0, y1) - radius, max(y0, y1) + radius
+    ax, ay = polygon[-1]
+    for bx, by in polygon:
+        # Edges wholly to one side of the capsule's box can't touch it
+        if not ((ax < left and bx < left) or (ax > right and bx > right) or
+                (ay < bottom and by < bottom) or (ay > top and by > top)):
+            if (segments_cross(ax, ay, bx, by, x0, y0, x1, y1) or
+                    _distance_sq(x0, y0, ax, ay, bx, by) <= reach or
+                    _distance_sq(x1, y1, ax, ay, bx, by) <= reach or
+                    _distance_sq(ax, ay, x0, y0, x1, y1) <= reach or
+                    _distance_sq(bx, by, x0, y0, x1, y1) <= reach):
+                return True
+        ax, ay = bx, by
+    return False
+
+
+def polygons_overlap(first, second, x, y):
+    """Whether two polygons touch, with second's origin at (x, y) relative to first's"""
+    moved = [(px + x, py + y) for px, py in second]
+    ax, ay = first[-1]
+    for bx, by in first:
+        cx, cy = moved[-1]
+        for dx, dy in moved:
+            if segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+                return True
+            cx, cy = dx, dy
+        ax, ay = bx, by
+    # No edges cross, so they only touch if one is wholly inside the other
+    return point_in_polygon(*moved[0], first) or point_in_polygon(*first[0], moved)
+
+
+def box_misses(box, left, bottom, right, top):
+    """Whether a (min x, min y, max x, max y) box and the given one are apart"""
+    min_x, min_y, max_x, max_y = box
+    return right < min_x or left > max_x or top < min_y or bottom > max_y
+
+
+def ray_hits_polygon(polygon, x, y, dx, dy):
+    """Distance along a ray from (x, y) with unit direction (dx, dy) to the polygon, or None"""
+    if point_in_polygon(x, y, polygon):
+        return 0.0
+    best = None
+    ax, ay = polygon[-1]
+    for bx, by in polygon:
+        ex = bx - ax
+        ey = by - ay
+        denominator = dx * ey - dy * ex
+        if denominator:
+            wx = ax - x
+            wy = ay - y
+            distance = (wx * ey - wy * ex) / denominator
+            along = (wx * dy - wy * dx) / denominator
+            if distance >= 0 and 0 <= along <= 1 and (best is None or distance < best):
+                best = distance
+        ax, ay = bx, by
+    return best
+
+
+def ship_hits_asteroid(player, asteroid):
+    """Ship triangle against an asteroid outline"""
+    if not player.config.polygon_collisions:
+        return asteroid.colliding_with(player)
+    offset = asteroid.position - player.position
+    reach = player.hit_radius + asteroid.hit_radius
+    if offset.length_squared() > reach * reach:
+        return False
+    return polygons_overlap(player.hull, asteroid.outline, offset.x, offset.y)
+
+
+def ship_hits_circle(player, shape):
+    """Ship triangle against a round shape such as a power-up"""
+    if not player.config.polygon_collisions:
+        return player.colliding_with(shape)
+    offset = shape.position - player.position
+    reach = player.hit_radius + shape.radius
+    if offset.length_squared() > reach * reach:
+        return False
+    return triangle_hits_circle(player.hull, offset.x, offset.y, shape.radius)
+
+
+def asteroid_hits_circle(asteroid, position, radius):
+    """Asteroid outline against a circle, e.g. the player's shield"""
+    offset = position - asteroid.position
+    if not asteroid.config.polygon_collisions:
+        return offset.length() <= asteroid.radius + radius
+    reach = asteroid.hit_radius + radius
+    if offset.length_squared() > reach * reach:
+        return False
+    x, y = offset
+    if box_misses(asteroid.box, x - radius, y - radius, x + radius, y + radius):
+        return False
+    return polygon_hits_circle(asteroid.outline, x, y, radius)
+
+
+def shot_hits_asteroid(shot, asteroid, shot_travel, asteroid_travel):
+    """Asteroid outline against a shot's motion over the last step, taken relative to the asteroid.
+
+    Meant for pairs swept_hits() found, which already passed the moving
+    circle test; the travel times are the ones it swept.
+    """
+    if not asteroid.config.polygon_collisions:
+        return True
+    position = shot.position - asteroid.position
+    start = position - shot.velocity * shot_travel + asteroid.velocity * asteroid_travel
+    radius = shot.radius
+    if box_misses(asteroid.box, min(start.x, position.x) - radius, min(start.y, position.y) - radius,
+                  max(start.x, position.x) + radius, max(start.y, position.y) + radius):
+        return False
+    return polygon_hits_capsule(asteroid.outline, start.x, start.y, position.x, position.y, radius)
+
+
+def ray_distance(start, direction, center, radius):
+    """Distance along a ray (direction a unit vector) to where it enters a circle, or None if it misses"""
+    offset = center - start
+    along = offset.dot(direction)
+    miss = offset.length_squared() - along * along
+    reach = radius * radius
+    if miss > reach:
+        return None
+    distance = along - math.sqrt(reach - miss)
+    if distance < 0:
+        # Starting inside the circle hits it straight away; behind the start doesn't
+        return 0.0 if offset.length_squared() <= reach else None
+    return distance
+
+
+def ray_hits_asteroid(start, direction, asteroid):
+    """Distance along a ray to an asteroid's outline, or None if it misses"""
+    distance = ray_distance(start, direction, asteroid.position, asteroid.hit_radius)
+    if distance is None or not asteroid.config.polygon_collisions:
+        return distance
+    offset = start - asteroid.position
+    return ray_hits_polygon(asteroid.outline, offset.x, offset.y, direction.x, direction.y)
@@ -1,37 +1,73 @@
+import math
+
 import pygame
 
 from circleshape import CircleShape
-from shot import Shot
-from constants import PLAYER_RADIUS, PLAYER_TURN_ACCELERATION, PLAYER_MAX_TURN_SPEED, PLAYER_TURN_DRAG, PLAYER_ACCELERATION, PLAYER_MAX_SPEED, PLAYER_DRAG, PLAYER_SHOOT_SPEED, PLAYER_SHOOT_COOLDOWN
+from controls import KeyboardInput
+from powerup import PlayerShield, EFFECTS
+from weapons import WEAPONS
+from spritecache import RotationCache, draw_polygon
+from constants import SHIP_ROTATION_STEPS
 
 class Player(CircleShape):
+    tags = ("player",)
+    shot_pool = None  # ShotPool shared by all players, set up in create_world()
+    input_source = KeyboardInput()  # Anything with a poll() returning Controls
+    ship_sprites = None  # RotationCache of the ship outline, built on first draw
+    beams = None  # Bag of laser beams, set up in create_world()
+
     def __init__(self, x, y):
-        super().__init__(x, y, PLAYER_RADIUS)
+        super().__init__(x, y, self.config.player_radius)
 
         self.rotation = 0
         self.rotation_velocity = 0
         self.shooting_limiter = 0
         self.spawn_protection = 0.5  # Prevent shooting for 0.5 seconds after spawn
+        self.hull_rotation = None
+        self.hull_points = ()
         
         # Power-up system
-        self.active_powerups = {}
+        self.active_powerups = {}  # Timed effect name -> expiry, kept by the world's EffectScheduler
         self.shield = None
 
-    def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius
-        b = self.position - forward * self.radius - right
-        c = self.position - forward * self.radius + right
+    def local_triangle(self, rotation=0):
+        """Ship outline around the origin"""
+        forward = pygame.Vector2(0, 1).rotate(rotation)
+        right = pygame.Vector2(0, 1).rotate(rotation + 90) * self.radius / 1.5
+        return [forward * self.radius, -forward * self.radius - right, -forward * self.radius + right]
+
+    @property
+    def hull(self):
+        """Ship triangle around the origin as (x, y) tuples, for hit tests; rebuilt only when the ship turns"""
+        if self.hull_rotation != self.rotation:
+            self.hull_points = tuple((point.x, point.y) for point in self.local_triangle(self.rotation))
+            self.hull_rotation = self.rotation
+        return self.hull_points
 
-        return [a, b, c]
+    @property
+    def hit_radius(self):
+        if self.config.polygon_collisions:
+            # The back corners of the triangle stick out past radius
+            return self.radius * math.hypot(1, 1 / 1.5)
+        return self.radius
 
     def draw(self, screen):
-        pygame.draw.polygon(screen, "white", self.triangle(), 2)
+        # Cached per class, so worlds with a different ship size get their own sprites
+        cls = type(self)
+        if cls.ship_sprites is None:
+            cls.ship_sprites = RotationCache(self.local_triangle(), SHIP_ROTATION_STEPS)
+        rect = draw_polygon(screen, self.position, cls.ship_sprites.get(self.rotation),
+                            lambda: self.local_triangle(self.rotation))
         
         # Draw shield if active
         if self.shield and self.shield.active:
-            self.shield.draw(screen, self.position, self.radius)
+            rect = rect.union(self.shield.draw(screen, self.position, self.radius))
+        
+        # A thin ring per timed power-up
+        for ring, name in enumerate(self.active_powerups):
+            rect = rect.union(pygame.draw.circle(screen, EFFECTS[name].color, self.position,
+                                                 self.radius + 6 + 3 * ring, 1))
+        return rect
 
     def update(self, dt):
         self.shooting_limiter -= dt
@@ -43,23 +79,23 @@ class Player(CircleShape):
             if not self.shield.active:
                 self.shield = None
         
-        keys = pygame.key.get_pressed()
+        controls = self.input_source.poll()
 
-        if keys[pygame.K_a]:
+        if controls.left:
             self.rotate_accelerate(-dt)
-        if keys[pygame.K_d]:
+        if controls.right:
             self.rotate_accelerate(dt)
         
-        if keys[pygame.K_w]:
+        if controls.thrust:
             self.accelerate(dt)
-        if keys[pygame.K_s]:
+        if controls.reverse:
             self.accelerate(-dt)
-        if keys[pygame.K_SPACE]:
+        if controls.shoot:
             self.shoot(dt)
         
         # Apply drag and update position and rotation
-        self.velocity *= PLAYER_DRAG
-        self.rotation_velocity *= PLAYER_TURN_DRAG
+        self.velocity *= self.config.player_drag
+        self.rotation_velocity *= self.config.player_turn_drag
         self.position += self.velocity * dt
         self.rotation += self.rotation_velocity * dt
         
@@ -67,36 +103,52 @@ class Player(CircleShape):
         self.wrap_screen()
 
     def rotate_accelerate(self, dt):
-        rotation_accel = PLAYER_TURN_ACCELERATION * dt
+        rotation_accel = self.config.player_turn_acceleration * dt
         self.rotation_velocity += rotation_accel
         
         # Cap rotation velocity at max speed
-        if abs(self.rotation_velocity) > PLAYER_MAX_TURN_SPEED:
-            self.rotation_velocity = PLAYER_MAX_TURN_SPEED if self.rotation_velocity > 0 else -PLAYER_MAX_TURN_SPEED
+        max_turn_speed = self.config.player_max_turn_speed
+        if abs(self.rotation_velocity) > max_turn_speed:
+            self.rotation_velocity = max_turn_speed if self.rotation_velocity > 0 else -max_turn_speed
 
     def accelerate(self, dt):
+        acceleration = self.config.player_acceleration
+        max_speed = self.config.player_max_speed
+        if "speed" in self.active_powerups:
+            acceleration *= self.config.powerup_speed_boost
+            max_speed *= self.config.powerup_speed_boost
+        
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        acceleration = forward * PLAYER_ACCELERATION * dt
-        self.velocity += acceleration
+        self.velocity += forward * acceleration * dt
         
         # Cap velocity at max speed
-        if self.velocity.length() > PLAYER_MAX_SPEED:
-            self.velocity = self.velocity.normalize() * PLAYER_MAX_SPEED
+        if self.velocity.length() > max_speed:
+            self.velocity = self.velocity.normalize() * max_speed
 
     def shoot(self, dt):
         if self.shooting_limiter > 0 or self.spawn_protection > 0:
             return
 
-        self.shooting_limiter = PLAYER_SHOOT_COOLDOWN
-        shot = Shot(self.position.x, self.position.y)
-        shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
+        weapon = self.weapon
+        self.shooting_limiter = self.config.player_shoot_cooldown * weapon.cooldown(self.config)
+        if "rapid_fire" in self.active_powerups:
+            self.shooting_limiter /= self.config.powerup_rapid_fire_rate
+        weapon.fire(self)
+    
+    @property
+    def weapon(self):
+        """The gun from the current weapon power-up, or the blaster"""
+        for name in self.active_powerups:
+            weapon = WEAPONS.get(name)
+            if weapon:
+                return weapon
+        return WEAPONS["blaster"]
     
     def add_shield(self):
         """Add a shield to the player. Returns True if successfully added, False if already has one."""
         if self.shield and self.shield.active:
             return False  # Already has an active shield
         
-        from powerup import PlayerShield
         self.shield = PlayerShield()
         return True
     
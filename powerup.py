@@ -1,15 +1,204 @@
-import pygame
+import heapq
 import math
 from abc import ABC, abstractmethod
+from bisect import bisect
+
+import pygame
+
 from circleshape import CircleShape
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+EFFECTS = {}  # Effect types by name; registration order is also their index in save states
+
+
+def register_effect(effect):
+    """Add an effect type to EFFECTS and return it"""
+    if effect.name in EFFECTS:
+        raise ValueError(f"Power-up effect '{effect.name}' is already registered")
+    EFFECTS[effect.name] = effect
+    return effect
+
+
+class Effect(ABC):
+    """What picking up one kind of power-up does.
+
+    apply() returns False to leave the power-up lying where it is, e.g. a
+    second shield. symbol is the lines drawn on the pickup, around its centre.
+    """
+
+    name = None
+    color = "white"
+    symbol = ()
+
+    @abstractmethod
+    def apply(self, state, player):
+        pass
+
+
+class ShieldEffect(Effect):
+    """Absorbs one asteroid hit"""
+
+    name = "shield"
+    color = "cyan"
+    symbol = (((-4, 0), (4, 0)), ((0, -4), (0, 4)))
+
+    def apply(self, state, player):
+        return player.add_shield()
+
+
+class TimedEffect(Effect):
+    """Lasts config.powerup_durations[name] seconds; another pickup restarts the clock.
+
+    The player checks player.active_powerups for it, so the effect itself
+    holds no state.
+    """
+
+    def apply(self, state, player):
+        state.world.effects.start(player, self.name, state.config.powerup_durations[self.name])
+        return True
+
+
+class SpeedEffect(TimedEffect):
+    """Raises the ship's acceleration and top speed"""
+
+    name = "speed"
+    color = "yellow"
+    symbol = (((-4, -4), (0, 0)), ((0, 0), (-4, 4)), ((0, -4), (4, 0)), ((4, 0), (0, 4)))
+
+
+class RapidFireEffect(TimedEffect):
+    """Shortens the cooldown between shots"""
+
+    name = "rapid_fire"
+    color = "orange"
+    symbol = (((-4, -4), (-4, 4)), ((0, -4), (0, 4)), ((4, -4), (4, 4)))
+
+
+class WeaponEffect(TimedEffect):
+    """Swaps the ship's gun for the weapon of the same name in weapons.py while it lasts"""
+
+    def apply(self, state, player):
+        # One special weapon at a time; the newest pickup replaces the others
+        for name in WEAPON_EFFECTS:
+            state.world.effects.stop(player, name)
+        return super().apply(state, player)
+
+
+class SpreadEffect(WeaponEffect):
+    name = "spread"
+    color = "green"
+    symbol = (((0, 0), (-4, -4)), ((0, 0), (0, -5)), ((0, 0), (4, -4)))
+
+
+class LaserEffect(WeaponEffect):
+    name = "laser"
+    color = "magenta"
+    symbol = (((-5, 0), (5, 0)),)
+
+
+class HomingEffect(WeaponEffect):
+    name = "homing"
+    color = "deepskyblue"
+    symbol = (((-4, 4), (0, -4)), ((0, -4), (4, 4)))
+
+
+WEAPON_EFFECTS = ("spread", "laser", "homing")
+
+
+class BombEffect(Effect):
+    """Destroys every asteroid within config.powerup_bomb_radius of the ship"""
+
+    name = "bomb"
+    color = "red"
+    symbol = (((-4, -4), (4, 4)), ((-4, 4), (4, -4)))
+
+    def apply(self, state, player):
+        state.detonate(player.position, state.config.powerup_bomb_radius)
+        return True
+
+
+for effect in (ShieldEffect(), SpeedEffect(), RapidFireEffect(), BombEffect(),
+               SpreadEffect(), LaserEffect(), HomingEffect()):
+    register_effect(effect)
+
+
+class SpawnTable:
+    """Weighted choice between effects, e.g. SpawnTable({'shield': 4, 'bomb': 1})"""
+
+    def __init__(self, weights):
+        self.effects = []
+        self.totals = []
+        total = 0
+        for name, weight in weights.items():
+            if name not in EFFECTS:
+                raise ValueError(f"Unknown power-up: {name}")
+            if weight > 0:
+                total += weight
+                self.effects.append(EFFECTS[name])
+                self.totals.append(total)
+        self.total = total
+
+    def pick(self, rng):
+        """One effect from a single rng.random() draw, or None when every weight is zero"""
+        if not self.effects:
+            return None
+        return self.effects[bisect(self.totals, rng.random() * self.total)]
+
+
+class EffectScheduler:
+    """Timed effects on players, in a min-heap by expiry time.
+
+    update() pops only the effects that run out, so a tick costs the same
+    however many are active. A player's active_powerups maps effect name to
+    expiry time; restarting an effect leaves its old heap entry behind, and
+    that entry is skipped when it comes up because the times don't match.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []
+        self.count = 0  # Breaks ties, so equal expiry times never compare players
+
+    def __len__(self):
+        return len(self.heap)
+
+    def clear(self):
+        self.now = 0.0
+        self.heap.clear()
+
+    def start(self, player, name, duration):
+        self.schedule(player, name, self.now + duration)
+
+    def stop(self, player, name):
+        """End the named effect on player early, if it is running"""
+        player.active_powerups.pop(name, None)
+
+    def schedule(self, player, name, expires):
+        """Run the named effect on player until the clock reaches expires"""
+        player.active_powerups[name] = expires
+        heapq.heappush(self.heap, (expires, self.count, player, name))
+        self.count += 1
+
+    def update(self, dt):
+        """Advance the clock and end the effects that ran out; returns how many ended"""
+        self.now += dt
+        heap = self.heap
+        ended = 0
+        while heap and heap[0][0] <= self.now:
+            expires, _, player, name = heapq.heappop(heap)
+            if player.active_powerups.get(name) == expires:
+                del player.active_powerups[name]
+                ended += 1
+        return ended
 
 
 class PowerUp(CircleShape):
-    """Base class for all power-ups"""
+    """Drifting pickup that applies its effect to the player who touches it"""
     
-    def __init__(self, x, y, radius=15):
+    tags = ("powerup",)
+    
+    def __init__(self, x, y, effect, radius=12):
         super().__init__(x, y, radius)
+        self.effect = effect
         self.lifetime = 30.0  # Power-ups disappear after 30 seconds
         self.pulse_timer = 0.0  # For pulsing animation
     
@@ -19,64 +208,36 @@ class PowerUp(CircleShape):
         
         # Remove power-up if lifetime expired
         if self.lifetime <= 0:
-            self.kill()
+            self.expire()
         
         # Wrap around screen edges
         self.wrap_screen()
     
-    @abstractmethod
-    def apply_to_player(self, player):
-        """Apply the power-up effect to the player"""
-        pass
-    
-    @abstractmethod
-    def get_type(self):
-        """Return the power-up type identifier"""
-        pass
-
-
-class ShieldPowerUp(PowerUp):
-    """Shield power-up that gives the player a protective shield"""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, 12)
-        self.color = "cyan"
-    
     def draw(self, screen):
         # Pulsing effect
         pulse = abs(math.sin(self.pulse_timer))
         alpha_factor = 0.6 + 0.4 * pulse
+        color = self.effect.color
+        center_x, center_y = int(self.position.x), int(self.position.y)
         
-        # Draw outer ring (shield visual)
-        pygame.draw.circle(screen, self.color, (int(self.position.x), int(self.position.y)), 
-                         self.radius, 2)
+        # Draw outer ring
+        rect = pygame.draw.circle(screen, color, (center_x, center_y), self.radius, 2)
         
         # Draw inner core
         inner_radius = max(3, int(self.radius * 0.3 * alpha_factor))
-        pygame.draw.circle(screen, self.color, (int(self.position.x), int(self.position.y)), 
-                         inner_radius)
+        pygame.draw.circle(screen, color, (center_x, center_y), inner_radius)
         
-        # Draw power-up symbol (+ sign)
-        center_x, center_y = int(self.position.x), int(self.position.y)
-        symbol_size = 4
-        pygame.draw.line(screen, "white", 
-                        (center_x - symbol_size, center_y), 
-                        (center_x + symbol_size, center_y), 2)
-        pygame.draw.line(screen, "white", 
-                        (center_x, center_y - symbol_size), 
-                        (center_x, center_y + symbol_size), 2)
-    
-    def apply_to_player(self, player):
-        """Give the player a shield"""
-        return player.add_shield()
-    
-    def get_type(self):
-        return "shield"
+        # Draw the effect's symbol
+        for (x1, y1), (x2, y2) in self.effect.symbol:
+            pygame.draw.line(screen, "white", (center_x + x1, center_y + y1), (center_x + x2, center_y + y2), 2)
+        return rect
 
 
 class PlayerShield:
     """Shield effect for the player"""
     
+    __slots__ = ("active", "pulse_timer", "hit_flash")
+    
     def __init__(self):
         self.active = True
         self.pulse_timer = 0.0
@@ -89,7 +250,7 @@ class PlayerShield:
     
     def draw(self, screen, player_position, player_radius):
         if not self.active:
-            return
+            return None
         
         # Pulsing shield effect
         pulse = abs(math.sin(self.pulse_timer))
@@ -104,7 +265,7 @@ class PlayerShield:
         
         # Draw shield circle around player
         shield_radius = player_radius + 15
-        pygame.draw.circle(screen, color, 
+        rect = pygame.draw.circle(screen, color, 
                          (int(player_position.x), int(player_position.y)), 
                          shield_radius, 2)
         
@@ -119,6 +280,7 @@ class PlayerShield:
             if particle_alpha > 0.3:
                 pygame.draw.circle(screen, color, 
                                  (int(particle_x), int(particle_y)), 1)
+        return rect
     
     def take_hit(self):
         """Called when shield takes a hit"""
@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from constants import PROFILER_WINDOW
+
+_DISABLED = nullcontext()
+
+
+class _Section:
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.start)
+
+
+class Profiler:
+    """Scoped frame timers with rolling p50/p95/p99.
+
+    `with profiler.section("update"):` times a block. While disabled,
+    section() returns a shared no-op context, so leaving the timers in
+    hot paths costs one method call each.
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.enabled = False
+        self.overlay_visible = False
+        self.samples = {}
+        self.sections = {}
+        self.font = None
+
+    def section(self, name):
+        if not self.enabled:
+            return _DISABLED
+        section = self.sections.get(name)
+        if section is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            section = self.sections[name] = _Section(samples)
+        return section
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    def reset(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def stats(self):
+        """Per-section count, mean and percentiles, in milliseconds"""
+        rows = []
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+            rows.append({
+                'section': name,
+                'count': len(ordered),
+                'mean_ms': 1000 * sum(ordered) / len(ordered),
+                'p50_ms': 1000 * ordered[round(last * 0.50)],
+                'p95_ms': 1000 * ordered[round(last * 0.95)],
+                'p99_ms': 1000 * ordered[round(last * 0.99)],
+            })
+        return rows
+
+    def export(self, path):
+        """Write stats() to CSV or JSON, picked by the file extension"""
+        rows = self.stats()
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump(rows, f, indent=2)
+            else:
+                writer = csv.DictWriter(f, fieldnames=['section', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+                writer.writeheader()
+                writer.writerows(rows)
+
+    def draw_overlay(self, screen):
+        """Draw the timing table in the bottom-left corner; returns the covered rect"""
+        if not self.overlay_visible:
+            return None
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        rows = [("section", "p50", "p95", "p99 ms")]
+        for row in self.stats():
+            rows.append((row['section'], f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['p99_ms']:.2f}"))
+
+        # Values change every frame, so render directly rather than through the text cache.
+        # The default font is proportional, so each cell is placed on its own column
+        columns = (0, 140, 190, 240)
+        line_height = self.font.get_linesize()
+        x = 10
+        y = screen.get_height() - 10 - line_height * len(rows)
+        bounds = screen.fill("black", (x, y, columns[-1] + 60, line_height * len(rows)))
+        for i, row in enumerate(rows):
+            for column, text in zip(columns, row):
+                screen.blit(self.font.render(text, True, "yellow"), (x + column, y + i * line_height))
+        return bounds
+
+
+class StartupTimer:
+    """Wall-clock phases from launch to the first frame, for --startup-profile.
+
+    mark(name) closes the phase that ran since the previous mark.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def phases(self):
+        """(name, ms) for each phase in order"""
+        rows = []
+        previous = self.started
+        for name, at in self.marks:
+            rows.append((name, (at - previous) * 1000))
+            previous = at
+        return rows
+
+    def report(self):
+        rows = self.phases()
+        total = sum(ms for _, ms in rows)
+        lines = [f"{'phase':<16} {'ms':>8} {'share':>6}"]
+        for name, ms in rows:
+            lines.append(f"{name:<16} {ms:8.1f} {100 * ms / total if total else 0:5.0f}%")
+        lines.append(f"{'first frame':<16} {total:8.1f}")
+        return "\n".join(lines)
+
+
+# Shared by the main loop and the game states
+profiler = Profiler()
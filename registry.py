@@ -0,0 +1,119 @@
+class Bag:
+    """Unordered list with O(1) add, remove and membership tests.
+
+    remove() moves the last item into the hole, so items don't keep their
+    insertion order. Iterating while adding or removing is not safe; use
+    retain() or iterate over list(bag).
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.index = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item):
+        """Remove item if present; returns whether it was"""
+        slot = self.index.pop(item, None)
+        if slot is None:
+            return False
+        last = self.items.pop()
+        if last is not item:
+            self.items[slot] = last
+            self.index[last] = slot
+        return True
+
+    def retain(self, keep):
+        """Call keep(item) once per item and drop those it returns false for"""
+        items = self.items
+        index = self.index
+        # Walk backwards so the item swapped into a hole has already been seen
+        for slot in range(len(items) - 1, -1, -1):
+            item = items[slot]
+            if not keep(item):
+                del index[item]
+                last = items.pop()
+                if last is not item:
+                    items[slot] = last
+                    index[last] = slot
+
+    def clear(self):
+        self.items.clear()
+        self.index.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+
+class Registry:
+    """Live sprites of one world, filed by tag.
+
+    The registry joins sprites like a pygame Group (put it in a class's
+    containers), so Sprite.add and kill() keep it current without any
+    scans. Each sprite is filed under its class's `tags`, and
+    registry['asteroid'] is a Bag of the live asteroids.
+    """
+
+    _spritegroup = True  # Lets Sprite.add/kill treat the registry as a group
+
+    def __init__(self):
+        self.bags = {}
+
+    def __getitem__(self, tag):
+        bag = self.bags.get(tag)
+        if bag is None:
+            bag = self.bags[tag] = Bag()
+        return bag
+
+    def count(self, tag):
+        bag = self.bags.get(tag)
+        return len(bag) if bag else 0
+
+    def add_internal(self, sprite):
+        for tag in sprite.tags:
+            self[tag].add(sprite)
+
+    def remove_internal(self, sprite):
+        for tag in sprite.tags:
+            self.bags[tag].remove(sprite)
+
+    def has_internal(self, sprite):
+        return any(sprite in self[tag] for tag in sprite.tags)
+
+    def kill_in_order(self, sprites):
+        """kill() the sprites in the order they sit in their bags.
+
+        Bag.remove() fills holes from the back, so a bag's order after
+        several removals depends on the order they happen in. Killing by
+        position makes it depend only on which sprites go.
+        """
+        bags = self.bags
+        sprites.sort(key=lambda sprite: (sprite.tags[0], bags[sprite.tags[0]].index[sprite]))
+        for sprite in sprites:
+            sprite.kill()
+
+    def kill_all(self, tag):
+        """kill() every sprite with the tag"""
+        for sprite in list(self[tag]):
+            sprite.kill()
+
+    def empty(self):
+        """Drop every sprite at once, like Group.empty(); their kill() is not called"""
+        seen = set()
+        for bag in self.bags.values():
+            for sprite in bag:
+                if sprite not in seen:
+                    seen.add(sprite)
+                    sprite.remove_internal(self)
+            bag.clear()
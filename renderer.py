@@ -0,0 +1,119 @@
+import pygame
+
+from constants import DIRTY_RECT_LIMIT, DIRTY_AREA_LIMIT
+from textcache import text_cache
+
+
+class Renderer:
+    """Draws game states with dirty-rect updates instead of a full fill and flip.
+
+    A state's draw() returns the rects it drew. Each frame the renderer
+    erases last frame's rects, lets the state draw, and pushes only the old
+    and new rects to the display. States that report is_static() are not
+    redrawn at all once they are on screen. Switching states, an exposed
+    window or too many changed rects fall back to a full redraw.
+
+    overlay, if set, is called after the state draws and returns the rect
+    it covered (or None); static states keep redrawing while it is set.
+    """
+
+    def __init__(self, screen, background="black",
+                 max_rects=DIRTY_RECT_LIMIT, max_area=DIRTY_AREA_LIMIT):
+        self.screen = screen
+        self.background = background
+        self.max_rects = max_rects
+        self.max_area = max_area * screen.get_width() * screen.get_height()
+        self.previous = None  # Rects drawn last frame; None forces a full redraw
+        self.state = None
+        self.static = False
+        self.overlay = None
+
+        # Frame counters for profiling
+        self.full_frames = 0
+        self.dirty_frames = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to be a full redraw"""
+        self.previous = None
+
+    def render(self, state):
+        static = state.is_static()
+        if self.overlay is None and self.previous is not None and state is self.state and self.static and static:
+            self.skipped_frames += 1
+            return
+
+        if self.previous is None or state is not self.state:
+            self._full(state)
+        else:
+            for rect in self.previous:
+                self.screen.fill(self.background, rect)
+            rects = self._draw(state)
+            dirty = self.previous + rects
+
+            if len(dirty) > self.max_rects or sum(r.width * r.height for r in dirty) > self.max_area:
+                pygame.display.flip()
+                self.full_frames += 1
+            else:
+                pygame.display.update(dirty)
+                self.dirty_frames += 1
+            self.previous = rects
+
+        self.state = state
+        self.static = static
+
+    def _full(self, state):
+        self.screen.fill(self.background)
+        self.previous = self._draw(state)
+        pygame.display.flip()
+        self.full_frames += 1
+
+    def _draw(self, state):
+        rects = state.draw(self.screen)
+        if self.overlay:
+            rect = self.overlay(self.screen)
+            if rect:
+                rects.append(rect)
+        return rects
+
+
+class CachedLayer:
+    """Fixed screen area that is only repainted when its key changes"""
+
+    def __init__(self, rect, paint):
+        self.rect = pygame.Rect(rect)
+        self.paint = paint  # paint(surface, key), in layer coordinates
+        self.surface = None
+        self.key = None
+
+    def draw(self, screen, key):
+        if self.surface is None or key != self.key:
+            if self.surface is None:
+                self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            self.surface.fill((0, 0, 0, 0))
+            self.paint(self.surface, key)
+            self.key = key
+        return screen.blit(self.surface, self.rect)
+
+
+class TextLayer:
+    """Lines of centred text composed once into a single tightly sized surface"""
+
+    def __init__(self):
+        self.lines = None
+        self.surface = None
+        self.topleft = (0, 0)
+
+    def draw(self, screen, lines):
+        """lines is a tuple of (font, text, center); returns the covered rect"""
+        if lines != self.lines:
+            surfaces = [text_cache.render(font, text) for font, text, _ in lines]
+            rects = [surface.get_rect(center=center) for surface, (_, _, center) in zip(surfaces, lines)]
+            bounds = rects[0].unionall(rects[1:])
+
+            self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            for surface, rect in zip(surfaces, rects):
+                self.surface.blit(surface, rect.move(-bounds.x, -bounds.y))
+            self.topleft = bounds.topleft
+            self.lines = lines
+        return screen.blit(self.surface, self.topleft)
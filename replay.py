@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+from controls import Controls
+from config import Config
+from constants import FIXED_TIMESTEP
+
+# magic, version, seed, timestep, ticks, checksum, length of the settings JSON that follows
+HEADER = struct.Struct("<4sHQdIII")
+MAGIC = b"AREP"
+# Bumped whenever the same seed and inputs would play out differently:
+# 2: the registry's swap-remove bags changed the order entities are updated and hit in
+# 3: asteroids pick their outline and rotation from the game rng
+# 4: split pieces and new asteroids are built by the spawn queue at the end of the tick
+# 5: the world settings are stored with the inputs
+VERSION = 5
+RUN = struct.Struct("<HB")  # run length, input mask
+
+
+class Replay:
+    """Seed, timestep, world settings and player inputs of one game.
+
+    Inputs are stored once per Player.update poll, not per tick, since
+    ticks without a live player never read input. The settings are the
+    game's Config as JSON, so games played with --config or --set play
+    back under the same rules. The checksum of the final world lets
+    playback confirm it was bit-exact.
+    """
+
+    def __init__(self, seed, step=FIXED_TIMESTEP, settings=None):
+        self.seed = seed
+        self.step = step
+        self.settings = settings if settings is not None else Config().to_dict()
+        self.ticks = 0
+        self.checksum = 0
+        self.inputs = bytearray()
+
+    def to_bytes(self):
+        # Run-length encode the inputs, players hold keys for many ticks at a time
+        runs = bytearray()
+        inputs = self.inputs
+        i = 0
+        while i < len(inputs):
+            mask = inputs[i]
+            run = 1
+            while i + run < len(inputs) and inputs[i + run] == mask and run < 0xFFFF:
+                run += 1
+            runs += RUN.pack(run, mask)
+            i += run
+        settings = json.dumps(self.settings, sort_keys=True).encode()
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.step, self.ticks, self.checksum, len(settings))
+        return header + settings + bytes(runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, step, ticks, checksum, settings_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a replay file this version can read")
+
+        settings = json.loads(bytes(data[HEADER.size:HEADER.size + settings_size]))
+        replay = cls(seed, step, settings)
+        replay.ticks = ticks
+        replay.checksum = checksum
+        for run, mask in RUN.iter_unpack(data[HEADER.size + settings_size:]):
+            replay.inputs += bytes((mask,)) * run
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def config(self):
+        """The Config the game was recorded with"""
+        return Config(**self.settings)
+
+
+def world_checksum(world):
+    """CRC of everything the simulation decides, for comparing a playback with its recording"""
+    values = [world.score, world.lives]
+    for group in ('asteroids', 'shots', 'powerups'):
+        for shape in getattr(world, group):
+            values += (shape.position.x, shape.position.y, shape.velocity.x, shape.velocity.y, shape.radius)
+    player = world.player
+    if player:
+        values += (player.position.x, player.position.y, player.velocity.x, player.velocity.y, player.rotation)
+    return zlib.crc32(struct.pack(f"<{len(values)}d", *values))
+
+
+class Recorder:
+    """Records the games played in a PlayingState to a replay file.
+
+    PlayingState calls start(), tick() and stop(); the recording input
+    source wraps the real one and logs every poll. The first game is saved
+    to path and each retry after it to its own numbered file next to it
+    (game.rep, game-2.rep, game-3.rep, ...).
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.replay = None
+        self.games = 0
+        self.saved = []  # Paths written so far
+
+    def poll(self):
+        controls = self.source.poll()
+        if self.replay:
+            self.replay.inputs.append(controls.to_mask())
+        return controls
+
+    def start(self, seed, step, config):
+        self.replay = Replay(seed, step, config.to_dict())
+        self.games += 1
+
+    def tick(self):
+        self.replay.ticks += 1
+
+    def stop(self, world):
+        if not self.replay:
+            return
+        self.replay.checksum = world_checksum(world)
+        path = self.game_path(self.games)
+        self.replay.save(path)
+        self.saved.append(path)
+        self.replay = None
+
+    def game_path(self, game):
+        """File the given game (counting from 1) is saved to"""
+        if game == 1:
+            return self.path
+        root, extension = os.path.splitext(self.path)
+        return f"{root}-{game}{extension}"
+
+
+class ReplayInput:
+    """Input source that plays back the inputs of a replay"""
+
+    def __init__(self, replay):
+        self.inputs = replay.inputs
+        self.index = 0
+
+    def poll(self):
+        if self.index >= len(self.inputs):
+            return Controls()
+        mask = self.inputs[self.index]
+        self.index += 1
+        return Controls.from_mask(mask)
+
+
+def play(replay, config=None):
+    """Run a replay headless as fast as possible, under its recorded settings unless config is given; returns the finished Simulation"""
+    from simulation import Simulation
+
+    simulation = Simulation(ReplayInput(replay), step=replay.step, seed=replay.seed, config=config or replay.config())
+    simulation.step(replay.ticks)
+    return simulation
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a replay headless and check it against the recording")
+    parser.add_argument("path")
+    Config.add_arguments(parser)
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    simulation = play(replay, Config.from_args(args, replay.settings))
+    elapsed = time.perf_counter() - start
+
+    checksum = world_checksum(simulation.world)
+    print(f"{replay.ticks} ticks in {elapsed:.2f}s "
+          f"({replay.ticks * replay.step / max(elapsed, 1e-9):.0f}x real time), "
+          f"score {simulation.world.score}")
+    if checksum != replay.checksum:
+        print("Playback diverged from the recording")
+        sys.exit(1)
+    print("Playback matches the recording")
@@ -0,0 +1,238 @@
+"""Rewind a headless simulation and replay it with corrected inputs.
+
+    python rollback.py --ticks 8 --asteroids 300
+
+Rollback keeps the world state after each of the last ROLLBACK_TICKS
+ticks. When an input for an earlier tick turns out to be wrong (a late
+network packet, say), correct() restores the state from before that
+tick and resimulates up to the present with the fixed inputs.
+
+States are save_world() buffers. Only the newest is kept whole; each
+older one is stored as a compressed XOR against its successor. Most
+bytes don't change from one tick to the next, so the deltas are small,
+and the oldest can be dropped without touching the rest. Running the
+module times recording and an 8-tick resimulation of a busy scene.
+"""
+import argparse
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+import pygame
+
+from config import Config
+from controls import Controls, RandomPilot
+from simulation import Simulation
+from snapshot import save_world, restore_world
+
+ROLLBACK_TICKS = 16  # states kept, so inputs up to this many ticks late can still be corrected
+
+
+def _delta(newer, older):
+    """Compressed XOR of older against newer, plus older's bytes past the end of newer"""
+    shared = min(len(newer), len(older))
+    xor = np.bitwise_xor(np.frombuffer(newer, np.uint8, shared), np.frombuffer(older, np.uint8, shared))
+    return zlib.compress(xor.tobytes() + older[shared:], 1), len(older)
+
+
+def _undo(newer, delta, size):
+    """Rebuild the older state from newer and _delta()'s result"""
+    raw = zlib.decompress(delta)
+    shared = min(len(newer), size)
+    head = np.bitwise_xor(np.frombuffer(newer, np.uint8, shared), np.frombuffer(raw, np.uint8, shared))
+    return head.tobytes() + raw[shared:]
+
+
+class StateRing:
+    """The last capacity (tick, label, state) entries, newest whole and the rest as reverse deltas"""
+
+    def __init__(self, capacity=ROLLBACK_TICKS):
+        self.capacity = capacity
+        self.older = deque()  # (tick, label, delta, size), oldest first
+        self.newest = None  # (tick, label, state)
+
+    def __len__(self):
+        return len(self.older) + (self.newest is not None)
+
+    @property
+    def oldest_tick(self):
+        if self.older:
+            return self.older[0][0]
+        return self.newest[0] if self.newest else None
+
+    @property
+    def nbytes(self):
+        """Bytes held, for checking that memory stays bounded"""
+        held = sum(len(entry[2]) for entry in self.older)
+        return held + (len(self.newest[2]) if self.newest else 0)
+
+    def push(self, tick, label, state):
+        """Add the state after tick; pushing the newest tick again replaces it"""
+        if self.newest is not None and self.newest[0] != tick:
+            newest_tick, newest_label, newest_state = self.newest
+            self.older.append((newest_tick, newest_label, *_delta(state, newest_state)))
+            if len(self.older) >= self.capacity:
+                self.older.popleft()
+        self.newest = (tick, label, state)
+
+    def get(self, tick):
+        """(label, state) stored for tick; raises KeyError if it has left the ring"""
+        if self.newest is None:
+            raise KeyError(tick)
+        newest_tick, label, state = self.newest
+        if tick == newest_tick:
+            return label, state
+        for entry_tick, label, delta, size in reversed(self.older):
+            state = _undo(state, delta, size)
+            if entry_tick == tick:
+                return label, state
+        raise KeyError(tick)
+
+    def truncate(self, tick):
+        """Make tick the newest entry, dropping every later one; returns its (label, state)"""
+        label, state = self.get(tick)
+        while self.older and self.older[-1][0] >= tick:
+            self.older.pop()
+        self.newest = (tick, label, state)
+        return label, state
+
+
+class InputLog:
+    """Input source with controls per tick; ticks without an entry repeat the latest earlier one"""
+
+    def __init__(self, window=ROLLBACK_TICKS):
+        self.window = window
+        self.controls = {}
+        self.tick = 0  # Set by Rollback before each step
+
+    def set(self, tick, controls):
+        self.controls[tick] = controls
+        # Entries this far back can no longer be corrected or predicted from
+        self.controls.pop(tick - 4 * self.window, None)
+
+    def poll(self):
+        for tick in range(self.tick, self.tick - 4 * self.window, -1):
+            controls = self.controls.get(tick)
+            if controls is not None:
+                return controls
+        return Controls()
+
+
+class Rollback:
+    """Records a Simulation tick by tick so it can be rewound and resimulated.
+
+    The simulation must read its input from inputs. Drive it with step()
+    rather than Simulation.step(), so every tick's state is recorded.
+    """
+
+    def __init__(self, simulation, inputs, capacity=ROLLBACK_TICKS):
+        self.simulation = simulation
+        self.inputs = inputs
+        self.states = StateRing(capacity)
+        self.resimulated = 0
+        self.save()
+
+    def save(self):
+        simulation = self.simulation
+        label = next(name for name, state in simulation.state_machine.states.items()
+                     if state is simulation.state_machine.current_state)
+        self.states.push(simulation.ticks, label, save_world(simulation.world))
+
+    def step(self, controls=None):
+        """Run one tick, with controls as its input if given, and record the result"""
+        simulation = self.simulation
+        if controls is not None:
+            self.inputs.set(simulation.ticks, controls)
+        self.inputs.tick = simulation.ticks
+        simulation.step()
+        self.save()
+
+    def rewind(self, tick):
+        """Put the world back to how it was just before tick ran"""
+        try:
+            label, state = self.states.truncate(tick)
+        except KeyError:
+            raise ValueError(f"Tick {tick} is outside the rollback window") from None
+        simulation = self.simulation
+        restore_world(simulation.world, state)
+        # The saved world already holds everything enter() would set up
+        simulation.state_machine.current_state = simulation.state_machine.states[label]
+        simulation.ticks = tick
+
+    def correct(self, tick, controls):
+        """Replace the input for tick; if it already ran, resimulate up to now. Returns the ticks resimulated."""
+        self.inputs.set(tick, controls)
+        now = self.simulation.ticks
+        if tick >= now:
+            return 0
+        self.rewind(tick)
+        while self.simulation.ticks < now:
+            self.step()
+        self.resimulated += now - tick
+        return now - tick
+
+
+def top_up(world, count):
+    """Spawn asteroids at random spots until there are count of them"""
+    field = world.asteroid_field
+    rng = world.rng
+    config = world.config
+    while field and len(world.asteroids) < count:
+        position = pygame.Vector2(rng.uniform(0, config.screen_width), rng.uniform(0, config.screen_height))
+        velocity = pygame.Vector2(rng.uniform(40, 100), 0).rotate(rng.uniform(0, 360))
+        field.spawn(config.asteroid_min_radius * rng.randint(1, config.asteroid_kinds), position, velocity)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Asteroids rollback timing")
+    parser.add_argument("--ticks", type=int, default=8, help="ticks to resimulate per correction (default 8)")
+    parser.add_argument("--warmup", type=int, default=600, help="ticks to play before timing (default 600)")
+    parser.add_argument("--corrections", type=int, default=50, help="corrections to time (default 50)")
+    parser.add_argument("--asteroids", type=int, default=150,
+                        help="asteroids to top the scene up to before each timed stretch (default 150)")
+    parser.add_argument("--seed", type=int, default=1)
+    Config.add_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = Config.from_args(args)
+    if not args.config and not args.set:
+        # Enough lives that the game never ends mid-run
+        config.update({'player_lives': 1000})
+
+    pilot = RandomPilot(args.seed)
+    inputs = InputLog()
+    simulation = Simulation(inputs, seed=args.seed, config=config)
+    rollback = Rollback(simulation, inputs)
+    for _ in range(args.warmup):
+        rollback.step(pilot.poll())
+
+    step_times = []
+    correction_times = []
+    world = simulation.world
+    for _ in range(args.corrections):
+        # Deaths clear the field, so keep the scene busy by hand and record that as the current tick
+        top_up(world, args.asteroids)
+        rollback.save()
+        for _ in range(args.ticks):
+            started = time.perf_counter()
+            rollback.step(pilot.poll())
+            step_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        rollback.correct(simulation.ticks - args.ticks, pilot.poll())
+        correction_times.append(time.perf_counter() - started)
+
+    budget = config.fixed_timestep * 1000
+    correction_times.sort()
+    print(f"{len(world.asteroids)} asteroids, {len(world.shots)} shots, "
+          f"{len(rollback.states)} states in {rollback.states.nbytes / 1024:.0f} KiB")
+    print(f"step + record: {1000 * sum(step_times) / len(step_times):.2f} ms per tick")
+    print(f"rewind + resimulate {args.ticks} ticks: p50 {1000 * correction_times[len(correction_times) // 2]:.2f} ms, "
+          f"max {1000 * correction_times[-1]:.2f} ms (frame budget {budget:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
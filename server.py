@@ -0,0 +1,476 @@
+"""Authoritative game server: many rooms, one fixed-rate simulation each.
+
+    python server.py --port 7777
+    python server.py --load-test 50 --seconds 10
+
+Clients talk to the server over UDP. They send JOIN once and then one
+INPUT per tick, carrying their controls and the last snapshot they
+received. The server steps every room at the fixed timestep and sends
+each client a snapshot of the room every SNAPSHOT_INTERVAL ticks. A
+snapshot is encoded against the one the client last acknowledged. Only
+new, moved and removed entities are sent, with positions quantized to
+1/POSITION_SCALE pixel. A snapshot too big for one datagram is split
+into parts, each under MAX_DATAGRAM, and a client applies it once every
+part has arrived. The first client in a room flies the ship; later
+ones watch. Clients that send nothing for CLIENT_TIMEOUT seconds are
+dropped like ones that sent LEAVE, and rooms without clients are closed.
+
+--load-test runs the server together with one LoopbackClient per room
+over real loopback sockets. It reports how much of each tick the server
+spends and how many rooms one core could sustain.
+"""
+import argparse
+import asyncio
+import struct
+import sys
+import time
+
+from config import Config
+from controls import Controls, RandomPilot
+from simulation import Simulation
+
+# Message types
+JOIN = 1
+INPUT = 2
+LEAVE = 3
+SNAPSHOT = 4
+
+JOIN_MESSAGE = struct.Struct("<BI")  # type, room
+INPUT_MESSAGE = struct.Struct("<BIIBI")  # type, room, tick, controls mask, acked snapshot tick
+LEAVE_MESSAGE = struct.Struct("<BI")  # type, room
+# type, room, tick, base tick (NO_BASE for a full snapshot), part, parts, score, lives, full, moved, removed
+SNAPSHOT_HEADER = struct.Struct("<BIIIHHIBHHH")
+FULL_RECORD = struct.Struct("<IBhhH")  # id, kind, x, y, detail
+MOVED_RECORD = struct.Struct("<Ibb")  # id, dx, dy against the base snapshot
+REMOVED_RECORD = struct.Struct("<I")  # id
+
+NO_BASE = 0xFFFFFFFF
+
+# Entity kinds, in the order the registry tags are walked
+KINDS = ("player", "asteroid", "shot", "powerup")
+
+POSITION_SCALE = 4  # quantization steps per pixel; int16 then covers +-8191 px
+SNAPSHOT_INTERVAL = 3  # ticks between snapshots, 20 per second at 60 ticks
+SNAPSHOT_HISTORY = 32  # snapshots kept per room as delta bases
+MAX_DATAGRAM = 65507
+CLIENT_TIMEOUT = 5.0  # seconds of silence before a client is dropped
+
+
+def quantize(shape, kind):
+    """(x, y, detail) of an entity as sent on the wire"""
+    position = shape.position
+    if kind == 0:
+        # Ship heading in hundredths of a degree
+        detail = round(shape.rotation * 100) % 36000
+    else:
+        detail = round(shape.radius)
+    x = min(max(round(position.x * POSITION_SCALE), -32768), 32767)
+    y = min(max(round(position.y * POSITION_SCALE), -32768), 32767)
+    return x, y, min(detail, 65535)
+
+
+def encode_snapshot(room_id, tick, state, score, lives, base_tick=NO_BASE, base=None):
+    """Pack state ({id: (kind, x, y, detail)}) as a delta against base, or in full without one.
+
+    Returns the snapshot's datagrams: one unless its records don't fit in
+    MAX_DATAGRAM, in which case they are spread over as many as needed.
+    """
+    full = []
+    moved = []
+    removed = []
+    if base is None:
+        base = {}
+        base_tick = NO_BASE
+    for entity_id, record in state.items():
+        old = base.get(entity_id)
+        if old == record:
+            continue
+        if old is not None and old[0] == record[0] and old[3] == record[3]:
+            dx = record[1] - old[1]
+            dy = record[2] - old[2]
+            if -128 <= dx < 128 and -128 <= dy < 128:
+                moved.append(MOVED_RECORD.pack(entity_id, dx, dy))
+                continue
+        full.append(FULL_RECORD.pack(entity_id, *record))
+    for entity_id in base:
+        if entity_id not in state:
+            removed.append(REMOVED_RECORD.pack(entity_id))
+
+    # Parts hold disjoint records, so they can be applied to the base in any order
+    parts = [([], [], [])]
+    size = SNAPSHOT_HEADER.size
+    for section, records in enumerate((full, moved, removed)):
+        for record in records:
+            if size + len(record) > MAX_DATAGRAM:
+                parts.append(([], [], []))
+                size = SNAPSHOT_HEADER.size
+            parts[-1][section].append(record)
+            size += len(record)
+
+    datagrams = []
+    for part, (full, moved, removed) in enumerate(parts):
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT, room_id, tick, base_tick, part, len(parts), score,
+                                      min(lives, 255), len(full), len(moved), len(removed))
+        datagrams.append(b"".join([header, *full, *moved, *removed]))
+    return datagrams
+
+
+def decode_snapshot(datagrams, bases):
+    """Unpack every part of a snapshot into (header fields, state), looking its base up in bases by tick.
+
+    Returns None when the base is no longer known; the client then keeps
+    acknowledging its last snapshot until a usable one arrives.
+    """
+    _, room_id, tick, base_tick, _, _, score, lives, *_ = SNAPSHOT_HEADER.unpack_from(datagrams[0])
+    if base_tick == NO_BASE:
+        state = {}
+    elif base_tick in bases:
+        state = dict(bases[base_tick])
+    else:
+        return None
+
+    for data in datagrams:
+        full, moved, removed = SNAPSHOT_HEADER.unpack_from(data)[-3:]
+        offset = SNAPSHOT_HEADER.size
+        for entity_id, kind, x, y, detail in FULL_RECORD.iter_unpack(data[offset:offset + full * FULL_RECORD.size]):
+            state[entity_id] = (kind, x, y, detail)
+        offset += full * FULL_RECORD.size
+        for entity_id, dx, dy in MOVED_RECORD.iter_unpack(data[offset:offset + moved * MOVED_RECORD.size]):
+            kind, x, y, detail = state[entity_id]
+            state[entity_id] = (kind, x + dx, y + dy, detail)
+        offset += moved * MOVED_RECORD.size
+        for (entity_id,) in REMOVED_RECORD.iter_unpack(data[offset:offset + removed * REMOVED_RECORD.size]):
+            del state[entity_id]
+    return {'room': room_id, 'tick': tick, 'score': score, 'lives': lives}, state
+
+
+class NetworkInput:
+    """Input source holding the controls from the pilot's latest INPUT message"""
+
+    def __init__(self):
+        self.controls = Controls()
+
+    def poll(self):
+        return self.controls
+
+
+class Room:
+    """One authoritative game and the clients watching it"""
+
+    def __init__(self, room_id, config=None):
+        self.room_id = room_id
+        self.config = config
+        self.input = NetworkInput()
+        self.clients = {}  # address -> last acknowledged snapshot tick
+        self.last_seen = {}  # address -> server tick of the client's latest message
+        self.pilot = None
+        self.ids = {}
+        self.next_id = 0
+        self.history = {}
+        self.tick = 0
+        self.games = 0
+        self.new_game()
+
+    def new_game(self):
+        self.simulation = Simulation(self.input, config=self.config)
+        self.games += 1
+
+    def join(self, address, now=0):
+        self.clients.setdefault(address, NO_BASE)
+        self.last_seen[address] = now
+        if self.pilot is None:
+            self.pilot = address
+
+    def leave(self, address):
+        self.clients.pop(address, None)
+        self.last_seen.pop(address, None)
+        if self.pilot == address:
+            self.pilot = next(iter(self.clients), None)
+            self.input.controls = Controls()
+
+    def drop_silent(self, cutoff):
+        """Remove clients not heard from since server tick cutoff"""
+        for address, seen in list(self.last_seen.items()):
+            if seen < cutoff:
+                self.leave(address)
+
+    def receive_input(self, address, mask, ack, now=0):
+        if address not in self.clients:
+            return
+        self.last_seen[address] = now
+        if ack in self.history:
+            self.clients[address] = ack
+        if address == self.pilot:
+            self.input.controls = Controls.from_mask(mask)
+
+    def step(self):
+        self.simulation.step()
+        self.tick += 1
+        if self.simulation.game_over:
+            # Rooms keep running; the next game starts on the following tick
+            self.new_game()
+
+    def capture(self):
+        """Quantized state of every live entity, keyed by a stable per-room id"""
+        registry = self.simulation.world.registry
+        ids = {}
+        state = {}
+        for kind, tag in enumerate(KINDS):
+            for shape in registry[tag]:
+                entity_id = self.ids.get(shape)
+                if entity_id is None:
+                    entity_id = self.next_id
+                    self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+                ids[shape] = entity_id
+                state[entity_id] = (kind, *quantize(shape, kind))
+        # Only live sprites keep their id, so the map never outgrows the world
+        self.ids = ids
+        return state
+
+    def snapshots(self):
+        """Yield (address, datagram) for every client and snapshot part, each encoded against the client's own ack"""
+        state = self.capture()
+        self.history[self.tick] = state
+        self.history.pop(self.tick - SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL, None)
+
+        world = self.simulation.world
+        encoded = {}
+        for address, ack in self.clients.items():
+            # Clients acking the same base share one encoding
+            datagrams = encoded.get(ack)
+            if datagrams is None:
+                base = self.history.get(ack)
+                datagrams = encoded[ack] = encode_snapshot(self.room_id, self.tick, state, world.score,
+                                                           world.lives, ack, base)
+            for datagram in datagrams:
+                yield address, datagram
+
+
+class Server(asyncio.DatagramProtocol):
+    """Steps every room at the fixed timestep and streams snapshots to their clients"""
+
+    def __init__(self, config=None, max_rooms=1000, client_timeout=CLIENT_TIMEOUT):
+        self.config = config or Config()
+        self.max_rooms = max_rooms
+        # Counted in ticks, so a server that falls behind doesn't drop everyone at once
+        self.timeout_ticks = max(1, round(client_timeout / self.config.fixed_timestep))
+        self.rooms = {}
+        self.transport = None
+        self.tick = 0
+        self.tick_seconds = []  # server time spent per tick, for the load test
+        self.bytes_sent = 0
+        self.running = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        if not data:
+            return
+        kind = data[0]
+        try:
+            if kind == INPUT:
+                _, room_id, _, mask, ack = INPUT_MESSAGE.unpack(data)
+                room = self.rooms.get(room_id)
+                if room:
+                    room.receive_input(address, mask, ack, self.tick)
+            elif kind == JOIN:
+                _, room_id = JOIN_MESSAGE.unpack(data)
+                room = self.rooms.get(room_id)
+                if room is None and len(self.rooms) < self.max_rooms:
+                    room = self.rooms[room_id] = Room(room_id, self.config)
+                if room:
+                    room.join(address, self.tick)
+            elif kind == LEAVE:
+                _, room_id = LEAVE_MESSAGE.unpack(data)
+                room = self.rooms.get(room_id)
+                if room:
+                    room.leave(address)
+                    if not room.clients:
+                        del self.rooms[room_id]
+        except struct.error:
+            pass  # Malformed datagrams are dropped like lost ones
+
+    def step(self):
+        """Advance every room one tick and send the snapshots that are due"""
+        started = time.perf_counter()
+        self.tick += 1
+        send = self.tick % SNAPSHOT_INTERVAL == 0
+        self.drop_silent()
+        for room in list(self.rooms.values()):
+            room.step()
+            if send and self.transport:
+                for address, datagram in room.snapshots():
+                    self.transport.sendto(datagram, address)
+                    self.bytes_sent += len(datagram)
+        self.tick_seconds.append(time.perf_counter() - started)
+
+    def drop_silent(self):
+        """Drop clients that have gone quiet and close the rooms left empty"""
+        cutoff = self.tick - self.timeout_ticks
+        for room_id, room in list(self.rooms.items()):
+            room.drop_silent(cutoff)
+            if not room.clients:
+                del self.rooms[room_id]
+
+    async def run(self, duration=None):
+        """Tick until stop() or for duration seconds; late ticks are run back to back to catch up"""
+        loop = asyncio.get_running_loop()
+        step = self.config.fixed_timestep
+        started = next_tick = loop.time()
+        self.running = True
+        while self.running and (duration is None or loop.time() - started < duration):
+            self.step()
+            next_tick += step
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def stop(self):
+        self.running = False
+
+
+class LoopbackClient(asyncio.DatagramProtocol):
+    """Headless client: joins a room, sends its pilot's controls each tick and rebuilds the room from snapshots"""
+
+    def __init__(self, room_id, pilot=None):
+        self.room_id = room_id
+        self.pilot = pilot or RandomPilot(room_id)
+        self.transport = None
+        self.tick = 0
+        self.ack = NO_BASE
+        self.bases = {}
+        self.state = {}
+        self.header = None
+        self.parts = {}  # tick -> {part: datagram} of snapshots still missing parts
+        self.snapshots = 0
+        self.bytes_received = 0
+        self.stale = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.sendto(JOIN_MESSAGE.pack(JOIN, self.room_id))
+
+    def datagram_received(self, data, address):
+        if not data or data[0] != SNAPSHOT:
+            return
+        self.bytes_received += len(data)
+        _, _, tick, _, part, parts, *_ = SNAPSHOT_HEADER.unpack_from(data)
+        if self.ack != NO_BASE and tick <= self.ack:
+            return  # Reordered; an older snapshot must not replace a newer one
+        received = self.parts.setdefault(tick, {})
+        received[part] = data
+        if len(received) < parts:
+            return
+        # Older snapshots still missing parts can't complete usefully any more
+        for pending in [pending for pending in self.parts if pending <= tick]:
+            del self.parts[pending]
+        decoded = decode_snapshot(list(received.values()), self.bases)
+        if decoded is None:
+            self.stale += 1
+            return
+        self.header, self.state = decoded
+        self.bases[tick] = self.state
+        self.bases.pop(tick - SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL, None)
+        self.ack = tick
+        self.snapshots += 1
+
+    def send_input(self):
+        self.tick += 1
+        mask = self.pilot.poll().to_mask()
+        self.transport.sendto(INPUT_MESSAGE.pack(INPUT, self.room_id, self.tick, mask, self.ack))
+
+    def leave(self):
+        self.transport.sendto(LEAVE_MESSAGE.pack(LEAVE, self.room_id))
+
+
+async def load_test(rooms, seconds, config=None, host="127.0.0.1"):
+    """Run rooms rooms with one loopback client each for seconds; returns the summary"""
+    loop = asyncio.get_running_loop()
+    server = Server(config, max_rooms=rooms)
+    server_transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, 0))
+    address = server_transport.get_extra_info("sockname")
+
+    clients = []
+    for room_id in range(rooms):
+        _, client = await loop.create_datagram_endpoint(lambda room_id=room_id: LoopbackClient(room_id),
+                                                        remote_addr=address)
+        clients.append(client)
+
+    async def drive_clients():
+        step = server.config.fixed_timestep
+        while server.running or not server.tick:
+            for client in clients:
+                client.send_input()
+            await asyncio.sleep(step)
+
+    driver = asyncio.ensure_future(drive_clients())
+    await server.run(seconds)
+    server.stop()
+    await driver
+    for client in clients:
+        client.leave()
+        client.transport.close()
+    server_transport.close()
+
+    times = sorted(server.tick_seconds)
+    mean = sum(times) / len(times)
+    step = server.config.fixed_timestep
+    return {
+        'rooms': rooms,
+        'ticks': server.tick,
+        'mean_tick_ms': mean * 1000,
+        'p95_tick_ms': times[int(0.95 * (len(times) - 1))] * 1000,
+        'budget_used': mean / step,
+        'rooms_per_core': rooms * step / mean if mean else 0.0,
+        'snapshots_received': sum(client.snapshots for client in clients),
+        'stale_snapshots': sum(client.stale for client in clients),
+        'kbytes_per_room_second': server.bytes_sent / 1024 / rooms / (server.tick * step),
+        'entities_seen': sum(len(client.state) for client in clients),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Asteroids game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--max-rooms", type=int, default=1000)
+    parser.add_argument("--client-timeout", type=float, default=CLIENT_TIMEOUT,
+                        help=f"seconds of silence before a client is dropped (default {CLIENT_TIMEOUT:g})")
+    parser.add_argument("--load-test", type=int, metavar="ROOMS",
+                        help="run ROOMS rooms with a loopback client each and report server load")
+    parser.add_argument("--seconds", type=float, default=10, help="load test duration (default 10)")
+    Config.add_arguments(parser)
+    return parser.parse_args()
+
+
+async def serve(host, port, config, max_rooms, client_timeout=CLIENT_TIMEOUT):
+    loop = asyncio.get_running_loop()
+    server = Server(config, max_rooms, client_timeout)
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, port))
+    print(f"serving on {host}:{port} at {1 / server.config.fixed_timestep:.0f} ticks/s")
+    try:
+        await server.run()
+    finally:
+        transport.close()
+
+
+def main():
+    args = parse_args()
+    config = Config.from_args(args)
+    if args.load_test:
+        summary = asyncio.run(load_test(args.load_test, args.seconds, config, args.host))
+        print(f"{summary['rooms']} rooms, {summary['ticks']} ticks: "
+              f"mean {summary['mean_tick_ms']:.2f} ms, p95 {summary['p95_tick_ms']:.2f} ms per tick "
+              f"({100 * summary['budget_used']:.0f}% of budget)")
+        print(f"~{summary['rooms_per_core']:.0f} rooms per core, "
+              f"{summary['kbytes_per_room_second']:.1f} KiB/s per room, "
+              f"{summary['snapshots_received']} snapshots received ({summary['stale_snapshots']} stale)")
+        return 1 if summary['budget_used'] > 1 else 0
+    try:
+        asyncio.run(serve(args.host, args.port, config, args.max_rooms, args.client_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
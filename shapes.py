@@ -0,0 +1,99 @@
+import numpy as np
+import pygame
+
+from constants import SHAPE_TEMPLATES, SHAPE_ROTATIONS, SHAPE_SEED
+from spritecache import bake_polygon
+
+MIN_LUMPS = 8
+MAX_LUMPS = 12
+
+
+class AsteroidShape:
+    """One lumpy outline, precomputed at every rotation step.
+
+    points is an (n, 2) array around the origin. Rotations are quantized to
+    `rotations` steps so each one can be baked once and reused by every
+    asteroid that draws it. extent is the bounding radius and bounds the
+    (min x, min y, max x, max y) box of the outline at each rotation step.
+    """
+
+    def __init__(self, index, points, rotations):
+        self.index = index  # position in its pool, which is what snapshots store
+        angles = np.arange(rotations) * (2 * np.pi / rotations)
+        cos = np.cos(angles)[:, None]
+        sin = np.sin(angles)[:, None]
+        x = points[:, 0]
+        y = points[:, 1]
+        # (rotations, n, 2), same direction as Vector2.rotate
+        self.rotated = np.stack((x * cos - y * sin, x * sin + y * cos), axis=-1)
+        self.extent = float(np.hypot(x, y).max())  # bounding radius, the same at any rotation
+        self.bounds = [tuple(box) for box in
+                       np.concatenate((self.rotated.min(axis=1), self.rotated.max(axis=1)), axis=1).tolist()]
+        self.outlines = [None] * rotations
+        self.polygons = [None] * rotations
+
+    def points(self, rotation):
+        """Outline at a rotation step as a list of Vector2"""
+        return [pygame.Vector2(x, y) for x, y in self.rotated[rotation].tolist()]
+
+    def polygon(self, rotation):
+        """Outline at a rotation step as (x, y) tuples for the narrowphase, cached on first use"""
+        polygon = self.polygons[rotation]
+        if polygon is None:
+            polygon = self.polygons[rotation] = tuple(map(tuple, self.rotated[rotation].tolist()))
+        return polygon
+
+    def baked(self, rotation):
+        """(surface, offset) for a rotation step, baked on first use"""
+        outline = self.outlines[rotation]
+        if outline is None:
+            outline = self.outlines[rotation] = bake_polygon(self.rotated[rotation].tolist())
+        return outline
+
+
+class ShapeLibrary:
+    """Pools of asteroid outlines, one pool per radius class.
+
+    A pool is generated in one NumPy pass the first time its radius is
+    asked for (or by prepare()), from a generator seeded by the radius, so
+    every process and every world gets the same templates. Asteroids pick a
+    template and a rotation step from their world's rng.
+    """
+
+    def __init__(self, templates=SHAPE_TEMPLATES, rotations=SHAPE_ROTATIONS, seed=SHAPE_SEED):
+        self.templates = templates
+        self.rotations = rotations
+        self.seed = seed
+        self.pools = {}
+
+    def prepare(self, radii):
+        """Generate the pools for radii now instead of on first use"""
+        for radius in radii:
+            self.pool(radius)
+
+    def pool(self, radius):
+        pool = self.pools.get(radius)
+        if pool is None:
+            pool = self.pools[radius] = self._generate(radius)
+        return pool
+
+    def _generate(self, radius):
+        random = np.random.default_rng([self.seed, round(radius * 1000)])
+        counts = random.integers(MIN_LUMPS, MAX_LUMPS + 1, self.templates)
+        variation = random.uniform(0.7, 1.3, (self.templates, MAX_LUMPS))
+
+        # Lump i of a template with n lumps sits at angle 2*pi*i/n
+        index = np.arange(MAX_LUMPS)
+        angles = 2 * np.pi * index / counts[:, None]
+        lengths = radius * variation
+        points = np.stack((lengths * np.cos(angles), lengths * np.sin(angles)), axis=-1)
+        return [AsteroidShape(t, points[t, :count], self.rotations) for t, count in enumerate(counts.tolist())]
+
+    def pick(self, radius, rng):
+        """(shape, rotation step) for a new asteroid"""
+        pool = self.pool(radius)
+        return pool[rng.randrange(len(pool))], rng.randrange(self.rotations)
+
+
+# Shared by every world; pools hold no per-game state
+shape_library = ShapeLibrary()
@@ -1,14 +1,117 @@
 import pygame
 
 from circleshape import CircleShape
-from constants import SHOT_RADIUS
+from constants import SHOT_POOL_SIZE
 
 class Shot(CircleShape):
+    tags = ("shot",)
+    pool = None
+
     def __init__(self, x, y):
-        super().__init__(x, y, SHOT_RADIUS)
+        super().__init__(x, y, self.config.shot_radius)
+        self.lifetime = self.config.shot_lifetime
+        self.homing = False  # Steered towards target by PlayingState, see weapons.py
+        self.target = None
+
+    def reset(self, x, y):
+        """Bring a pooled shot back to life at the given position"""
+        self.position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        # Store-backed shots lost their row, and with it the radius, when they were killed
+        self.radius = self.config.shot_radius
+        self.lifetime = self.config.shot_lifetime
+        self.homing = False
+        self.target = None
+        if hasattr(self, "containers"):
+            self.add(self.containers)
 
     def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, 2)
+        if self.homing:
+            return pygame.draw.circle(screen, "deepskyblue", self.position, self.radius)
+        return pygame.draw.circle(screen, "white", self.position, self.radius, 2)
 
     def update(self, dt):
-        self.position += self.velocity * dt
\ No newline at end of file
+        self.position += self.velocity * dt
+        self.lifetime -= dt
+
+        # Shots don't wrap, so one that left the screen can never hit anything
+        if self.lifetime <= 0 or self.off_screen():
+            self.expire()
+
+    def off_screen(self):
+        return (self.position.x < -self.radius or self.position.x > self.config.screen_width + self.radius or
+                self.position.y < -self.radius or self.position.y > self.config.screen_height + self.radius)
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
+
+class ShotPool:
+    """Free list of Shot objects reused by Player.shoot"""
+
+    def __init__(self, size=SHOT_POOL_SIZE, shot_class=Shot):
+        self.shot_class = shot_class
+        self.free = []
+        self.shots = []
+        self.allocated = 0
+        self.peak_live = 0
+
+        for _ in range(size):
+            self._create(0, 0).kill()
+
+    def _create(self, x, y):
+        shot = self.shot_class(x, y)
+        shot.pool = self
+        shot.pooled = False
+        self.shots.append(shot)
+        self.allocated += 1
+        return shot
+
+    @property
+    def live(self):
+        return self.allocated - len(self.free)
+
+    def acquire(self, x, y):
+        """Return a live shot at the given position, reusing a free one if possible"""
+        if self.free:
+            shot = self.free.pop()
+            shot.pooled = False
+            shot.reset(x, y)
+        else:
+            shot = self._create(x, y)
+
+        self.peak_live = max(self.peak_live, self.live)
+        return shot
+
+    def fire(self, x, y, velocities):
+        """Launch a volley, one shot per velocity, all from the given position"""
+        shots = []
+        for velocity in velocities:
+            shot = self.acquire(x, y)
+            shot.velocity = velocity
+            shots.append(shot)
+        return shots
+
+    def release(self, shot):
+        """Return a killed shot to the free list"""
+        if shot.pooled:
+            return
+        shot.pooled = True
+        self.free.append(shot)
+
+    def reset(self):
+        """Free every shot at once, after the world was emptied without killing them"""
+        for shot in self.shots:
+            shot.pooled = True
+        self.free = list(self.shots)
+
+    def stats(self):
+        """Counters for checking that shot memory stays flat"""
+        return {
+            'live': self.live,
+            'free': len(self.free),
+            'allocated': self.allocated,
+            'peak_live': self.peak_live,
+        }
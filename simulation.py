@@ -0,0 +1,207 @@
+import pygame
+import random
+
+from constants import *
+from player import Player
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from shot import Shot, ShotPool
+from entitystore import EntityStore, StoredAsteroid, StoredShot
+from explosion import PlayerExplosion, AsteroidExplosion
+from particles import ParticleEngine
+from gamestate import GameStateMachine, PlayingState, GameOverState
+from powerup import PowerUp, SpawnTable, EffectScheduler
+from spawner import SpawnQueue
+from config import Config
+from registry import Registry, Bag
+from world import World
+from hud import draw_heart, ScoreAnimation
+from shapes import shape_library
+
+
+def world_class(cls, **attributes):
+    """Subclass cls for one world.
+
+    Entities find their sprite groups, rng and config through class
+    attributes, so each world gets its own subclasses and several worlds
+    can live in one process without sharing any of them. The subclass adds
+    no instance __dict__, so slotted classes stay slotted.
+    """
+    return type(cls.__name__, (cls,), {'__slots__': (), **attributes})
+
+
+def create_world(font=None, input_source=None, use_entity_store=False,
+                 seed=None, recorder=None, step=None, config=None):
+    """Build the World shared by the game states.
+
+    Each game is seeded from seed, or from a fresh random seed when it is
+    None. A Recorder, if given, also becomes the player's input source.
+    step defaults to the config's fixed timestep.
+    """
+    if config is None:
+        config = Config()
+    if step is None:
+        step = config.fixed_timestep
+
+    updatable = pygame.sprite.Group()
+    drawable = pygame.sprite.Group()
+    # Asteroids, shots, power-ups and the player, by tag
+    registry = Registry()
+
+    # Every random decision the simulation makes comes from this stream
+    rng = random.Random()
+    if recorder:
+        input_source = recorder
+
+    # Generate outlines for every asteroid size up front rather than mid-game
+    shape_library.prepare(config.asteroid_min_radius * kind for kind in range(1, config.asteroid_kinds + 1))
+
+    # One particle buffer shared by every explosion
+    particles = ParticleEngine(config.particle_capacity, config.particle_budgets, config.particle_damping)
+
+    # Optional array-backed motion for asteroids and shots
+    entity_store = None
+    asteroid_base = Asteroid
+    shot_base = Shot
+    moving = (registry, updatable, drawable)
+    stored = moving
+    store_attributes = {}
+    if use_entity_store:
+        entity_store = EntityStore(width=config.screen_width, height=config.screen_height)
+        asteroid_base = StoredAsteroid
+        shot_base = StoredShot
+        store_attributes['store'] = entity_store
+        # The store integrates these, so keep them out of the updatable group
+        stored = (registry, drawable)
+
+    # Shots and power-ups that run out are killed after the update pass, see PlayingState.update_entities()
+    expired = []
+    world_powerup = world_class(PowerUp, containers=moving, config=config, expired=expired)
+    world_asteroid = world_class(asteroid_base, containers=stored, rng=rng, config=config,
+                                 powerup_class=world_powerup, powerup_table=SpawnTable(config.powerup_weights),
+                                 **store_attributes)
+    # Split pieces and new asteroids are built a budget's worth per tick, see PlayingState.update()
+    spawner = world_asteroid.spawner = SpawnQueue(world_asteroid, config.asteroid_spawn_budget,
+                                                  config.asteroid_prewarm)
+    world_shot = world_class(shot_base, containers=stored, config=config, expired=expired, **store_attributes)
+    world_field = world_class(AsteroidField, containers=updatable, rng=rng, config=config,
+                              registry=registry, asteroid_class=world_asteroid, spawner=spawner)
+    shot_pool = ShotPool(config.shot_pool_size, world_shot)
+    beams = Bag()
+    world_player = world_class(Player, containers=moving, config=config, shot_pool=shot_pool, ship_sprites=None,
+                               beams=beams)
+    world_player_explosion = world_class(PlayerExplosion, particles=particles, rng=rng)
+    world_asteroid_explosion = world_class(AsteroidExplosion, particles=particles)
+    world_score_animation = world_class(ScoreAnimation, font=font)
+
+    def spawn_player():
+        player = world_player(config.screen_width / 2, config.screen_height / 2)
+        if input_source:
+            player.input_source = input_source
+        return player
+
+    def create_explosion(position):
+        return world_asteroid_explosion(position.x, position.y, 30)
+
+    return World(
+        config=config,
+        updatable=updatable,
+        drawable=drawable,
+        registry=registry,
+        asteroids=registry['asteroid'],
+        shots=registry['shot'],
+        powerups=registry['powerup'],
+        entity_store=entity_store,
+        particles=particles,
+        shot_pool=shot_pool,
+        effects=EffectScheduler(),
+        expired=expired,
+        lives=config.player_lives,
+        respawn_timer=0,
+        player=None,
+        explosion=None,
+        score=0,
+        asteroids_destroyed=0,
+        shields_used=0,
+        score_animations=Bag(),
+        asteroid_explosions=Bag(),
+        beams=beams,
+        spawn_player=spawn_player,
+        create_explosion=create_explosion,
+        draw_heart=draw_heart,
+        font=font,
+        ScoreAnimation=world_score_animation,
+        PlayerExplosion=world_player_explosion,
+        AsteroidExplosion=world_asteroid_explosion,
+        Asteroid=world_asteroid,
+        PowerUp=world_powerup,
+        AsteroidField=world_field,
+        asteroid_field=None,
+        spawner=spawner,
+        rng=rng,
+        seed=seed,
+        game_seed=None,
+        timestep=step,
+        recorder=recorder,
+    )
+
+
+class FixedTimestep:
+    """Accumulates real frame time and hands it out as whole fixed ticks.
+
+    max_steps=None never drops time, which is what headless runs want.
+    """
+
+    def __init__(self, step=FIXED_TIMESTEP, max_steps=MAX_STEPS_PER_FRAME):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """Add elapsed seconds and return how many ticks to run"""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+        if self.max_steps is not None and steps > self.max_steps:
+            # Too far behind (debugger, window drag); drop the backlog instead of spiralling
+            self.accumulator = 0.0
+            return self.max_steps
+        self.accumulator -= steps * self.step
+        return steps
+
+
+class Simulation:
+    """Headless game: runs the playing and game over states with no window or fonts"""
+
+    def __init__(self, input_source, step=None, use_entity_store=False, seed=None, recorder=None, config=None):
+        self.world = create_world(input_source=input_source, use_entity_store=use_entity_store,
+                                                seed=seed, recorder=recorder, step=step, config=config)
+        self.timestep = FixedTimestep(self.world.timestep, max_steps=None)
+        self.ticks = 0
+
+        self.state_machine = GameStateMachine()
+        self.state_machine.add_state('playing', PlayingState(self.state_machine, self.world))
+        self.state_machine.add_state('game_over', GameOverState(self.state_machine, self.world, None, None))
+        self.state_machine.change_state('playing')
+
+    @property
+    def game_over(self):
+        return self.state_machine.current_state is self.state_machine.states['game_over']
+
+    def step(self, ticks=1):
+        """Advance the simulation by a number of fixed ticks"""
+        for _ in range(ticks):
+            self.state_machine.update(self.timestep.step)
+            self.ticks += 1
+
+    def advance(self, elapsed):
+        """Advance by elapsed seconds of game time; returns the ticks run"""
+        ticks = self.timestep.advance(elapsed)
+        self.step(ticks)
+        return ticks
+
+    def run(self, max_ticks):
+        """Step until the game is over or max_ticks have run; returns the ticks run"""
+        start = self.ticks
+        while not self.game_over and self.ticks - start < max_ticks:
+            self.step()
+        return self.ticks - start
@@ -0,0 +1,353 @@
+"""Binary save states of a whole game world.
+
+save_world() packs everything PlayingState simulates into one bytes
+object: entities, effects, timers, counters and both random streams.
+restore_world() rebuilds that world in place, so the game carries on
+exactly as it would have from the moment it was saved. Entities are
+stored column by column in array/struct buffers and recreated without
+drawing from the rng, so nothing is pickled and a world of thousands of
+asteroids round-trips in milliseconds.
+"""
+import array
+import math
+import struct
+import sys
+
+import numpy as np
+import pygame
+
+from powerup import PlayerShield, EFFECTS
+
+MAGIC = b"ASTW"
+VERSION = 5
+
+# magic, version, flags, score, lives, asteroids destroyed, shields used, respawn timer,
+# spawn timer, particle cursor, then the counts of live particles, asteroids, shots,
+# power-ups, score animations and asteroid explosions, the length of the score texts,
+# the power-up effect clock, the player's timed power-up count and the count of queued asteroids
+HEADER = struct.Struct("<4sHBqiqqddIIIIIIIIdII")
+HAS_PLAYER = 1
+HAS_SHIELD = 2
+HAS_EXPLOSION = 4
+HAS_FIELD = 8
+
+RNG_STATE = struct.Struct("<d625I")  # gauss_next (NaN for none), Mersenne Twister state and index
+PARTICLE_RNG_STATE = struct.Struct("<16s16sBI")  # PCG64 state, increment, has_uint32, uinteger
+PLAYER = struct.Struct("<8d")  # x, y, vx, vy, rotation, rotation velocity, shot cooldown, spawn protection
+SHIELD = struct.Struct("<B2d")  # active, pulse timer, hit flash
+PLAYER_EXPLOSION = struct.Struct("<7d")  # x, y, rotation, rotation speed, scale, lifetime, max lifetime
+
+# Power-up effects are saved as their index in the effect registry
+EFFECT_INDEX = {name: index for index, name in enumerate(EFFECTS)}
+EFFECT_NAMES = tuple(EFFECTS)
+
+
+def _pack(typecode, values):
+    column = array.array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+class _Reader:
+    """Walks a save state front to back"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def column(self, typecode, count):
+        column = array.array(typecode)
+        size = column.itemsize * count
+        column.frombytes(self.data[self.offset:self.offset + size])
+        if sys.byteorder != "little":
+            column.byteswap()
+        self.offset += size
+        return column
+
+    def bytes(self, size):
+        value = bytes(self.data[self.offset:self.offset + size])
+        self.offset += size
+        return value
+
+    def numpy(self, dtype, shape):
+        count = int(np.prod(shape))
+        value = np.frombuffer(self.data, dtype, count, self.offset).reshape(shape)
+        self.offset += value.nbytes
+        return value
+
+
+def clear_world(world):
+    """Drop every entity and effect at once, without calling their kill()"""
+    world.score_animations.clear()
+    world.asteroid_explosions.clear()
+    world.beams.clear()
+    world.particles.clear()
+    world.updatable.empty()
+    world.drawable.empty()
+    world.registry.empty()
+    world.shot_pool.reset()
+    world.effects.clear()
+    world.spawner.clear()
+    if world.entity_store:
+        world.entity_store.clear()
+    world.player = None
+    world.explosion = None
+    world.asteroid_field = None
+
+
+def save_world(world):
+    """Pack the world's simulation state into bytes"""
+    player = world.player
+    explosion = world.explosion
+    field = world.asteroid_field
+    particles = world.particles
+    asteroids = list(world.asteroids)
+    shots = list(world.shots)
+    powerups = list(world.powerups)
+    animations = list(world.score_animations)
+    explosions = list(world.asteroid_explosions)
+    # Dead particles are never read again before emit() overwrites them, so only live ones are saved
+    alive = np.flatnonzero(particles.lifetime > 0)
+    texts = "\0".join(animation.text for animation in animations).encode()
+    timed = list(player.active_powerups.items()) if player else []
+    orders = list(world.spawner.orders)
+
+    flags = 0
+    if player:
+        flags |= HAS_PLAYER
+        if player.shield:
+            flags |= HAS_SHIELD
+    if explosion:
+        flags |= HAS_EXPLOSION
+    if field:
+        flags |= HAS_FIELD
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION, flags, world.score, world.lives,
+        world.asteroids_destroyed, world.shields_used, world.respawn_timer,
+        field.spawn_timer if field else 0.0, particles.cursor, len(alive),
+        len(asteroids), len(shots), len(powerups), len(animations), len(explosions), len(texts),
+        world.effects.now, len(timed), len(orders),
+    )]
+
+    _, internal, gauss = world.rng.getstate()
+    parts.append(RNG_STATE.pack(math.nan if gauss is None else gauss, *internal))
+    bit_state = particles.random.bit_generator.state
+    parts.append(PARTICLE_RNG_STATE.pack(
+        bit_state['state']['state'].to_bytes(16, "little"), bit_state['state']['inc'].to_bytes(16, "little"),
+        bit_state['has_uint32'], bit_state['uinteger'],
+    ))
+    parts.append(alive.astype("<u4").tobytes())
+    for column in (particles.position, particles.velocity, particles.lifetime,
+                   particles.max_lifetime, particles.emitter):
+        parts.append(column[alive].astype(column.dtype.newbyteorder("<"), copy=False).tobytes())
+
+    if player:
+        parts.append(PLAYER.pack(*player.position, *player.velocity, player.rotation, player.rotation_velocity,
+                                 player.shooting_limiter, player.spawn_protection))
+        if player.shield:
+            shield = player.shield
+            parts.append(SHIELD.pack(shield.active, shield.pulse_timer, shield.hit_flash))
+        parts.append(_pack('B', [EFFECT_INDEX[name] for name, _ in timed]))
+        parts.append(_pack('d', [expires for _, expires in timed]))
+    if explosion:
+        parts.append(PLAYER_EXPLOSION.pack(*explosion.position, explosion.rotation, explosion.rotation_speed,
+                                           explosion.scale, explosion.lifetime, explosion.max_lifetime))
+
+    parts.append(_pack('d', [value for asteroid in asteroids
+                             for value in (*asteroid.position, *asteroid.velocity, asteroid.radius)]))
+    parts.append(_pack('H', [asteroid.shape.index for asteroid in asteroids]))
+    parts.append(_pack('B', [asteroid.rotation for asteroid in asteroids]))
+    # Asteroids waiting in the spawn queue, in the same layout
+    parts.append(_pack('d', [value for x, y, radius, velocity, _, _ in orders for value in (x, y, *velocity, radius)]))
+    parts.append(_pack('H', [order[4] for order in orders]))
+    parts.append(_pack('B', [order[5] for order in orders]))
+
+    parts.append(_pack('d', [value for shot in shots for value in (*shot.position, *shot.velocity, shot.lifetime)]))
+    # Homing targets by position in the asteroid column, -1 for none or one that has since died
+    asteroid_index = {asteroid: index for index, asteroid in enumerate(asteroids)}
+    parts.append(_pack('B', [shot.homing for shot in shots]))
+    parts.append(_pack('i', [asteroid_index.get(shot.target, -1) for shot in shots]))
+
+    parts.append(_pack('d', [value for powerup in powerups
+                             for value in (*powerup.position, *powerup.velocity, powerup.lifetime, powerup.pulse_timer)]))
+    parts.append(_pack('B', [EFFECT_INDEX[powerup.effect.name] for powerup in powerups]))
+
+    parts.append(_pack('d', [value for animation in animations
+                             for value in (animation.x, animation.y, animation.lifetime)]))
+    parts.append(texts)
+    parts.append(_pack('d', [value for effect in explosions
+                             for value in (*effect.position, effect.lifetime, effect.max_lifetime)]))
+    return b"".join(parts)
+
+
+def restore_world(world, data):
+    """Replace the world's contents with a state from save_world()"""
+    reader = _Reader(data)
+    (magic, version, flags, score, lives, asteroids_destroyed, shields_used, respawn_timer, spawn_timer,
+     cursor, particle_count, asteroid_count, shot_count, powerup_count, animation_count, explosion_count,
+     text_size, effect_clock, timed_count, order_count) = reader.unpack(HEADER)
+    if magic != MAGIC:
+        raise ValueError("Not a world save state")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save state version {version}")
+
+    particles = world.particles
+    rng_values = reader.unpack(RNG_STATE)
+    particle_state, particle_inc, has_uint32, uinteger = reader.unpack(PARTICLE_RNG_STATE)
+    alive = reader.numpy("<u4", particle_count)
+    position = reader.numpy("<f8", (particle_count, 2))
+    velocity = reader.numpy("<f8", (particle_count, 2))
+    lifetime = reader.numpy("<f8", particle_count)
+    max_lifetime = reader.numpy("<f8", particle_count)
+    emitter = reader.numpy("i1", particle_count)
+
+    # Asteroids are overwritten in place further down, since creating thousands
+    # of sprites would be most of a restore; everything else is rebuilt
+    registry = world.registry
+    for tag in ('player', 'shot', 'powerup'):
+        registry.kill_all(tag)
+    if world.asteroid_field:
+        world.asteroid_field.kill()
+    world.player = None
+    world.explosion = None
+    world.asteroid_field = None
+    world.score_animations.clear()
+    world.asteroid_explosions.clear()
+    world.beams.clear()
+    world.effects.clear()
+    world.effects.now = effect_clock
+    world.spawner.clear()
+    live = list(world.asteroids)
+    # Killing from the back keeps the survivors in bag order
+    for asteroid in reversed(live[asteroid_count:]):
+        asteroid.kill()
+
+    world.score = score
+    world.lives = lives
+    world.asteroids_destroyed = asteroids_destroyed
+    world.shields_used = shields_used
+    world.respawn_timer = respawn_timer
+
+    gauss = rng_values[0]
+    world.rng.setstate((3, rng_values[1:], None if math.isnan(gauss) else gauss))
+    random = np.random.default_rng()
+    random.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': int.from_bytes(particle_state, "little"), 'inc': int.from_bytes(particle_inc, "little")},
+        'has_uint32': has_uint32,
+        'uinteger': uinteger,
+    }
+    particles.random = random
+    particles.cursor = cursor
+    particles.clear()
+    particles.position[alive] = position
+    particles.velocity[alive] = velocity
+    particles.lifetime[alive] = lifetime
+    particles.max_lifetime[alive] = max_lifetime
+    particles.emitter[alive] = emitter
+
+    if flags & HAS_FIELD:
+        field = world.asteroid_field = world.AsteroidField()
+        field.spawn_timer = spawn_timer
+
+    if flags & HAS_PLAYER:
+        x, y, vx, vy, rotation, rotation_velocity, shooting_limiter, spawn_protection = reader.unpack(PLAYER)
+        player = world.player = world.spawn_player()
+        player.position = pygame.Vector2(x, y)
+        player.velocity = pygame.Vector2(vx, vy)
+        player.rotation = rotation
+        player.rotation_velocity = rotation_velocity
+        player.shooting_limiter = shooting_limiter
+        player.spawn_protection = spawn_protection
+        if flags & HAS_SHIELD:
+            active, pulse_timer, hit_flash = reader.unpack(SHIELD)
+            player.shield = PlayerShield()
+            player.shield.active = bool(active)
+            player.shield.pulse_timer = pulse_timer
+            player.shield.hit_flash = hit_flash
+        names = reader.column('B', timed_count)
+        expiries = reader.column('d', timed_count)
+        for index in range(timed_count):
+            world.effects.schedule(player, EFFECT_NAMES[names[index]], expiries[index])
+
+    if flags & HAS_EXPLOSION:
+        x, y, rotation, rotation_speed, scale, lifetime, max_lifetime = reader.unpack(PLAYER_EXPLOSION)
+        # Skip __init__, which would emit particles the saved engine already has
+        explosion_class = world.PlayerExplosion
+        explosion = world.explosion = explosion_class.__new__(explosion_class)
+        explosion.position = pygame.Vector2(x, y)
+        explosion.rotation = rotation
+        explosion.rotation_speed = rotation_speed
+        explosion.scale = scale
+        explosion.lifetime = lifetime
+        explosion.max_lifetime = max_lifetime
+
+    motion = reader.column('d', asteroid_count * 5)
+    shapes = reader.column('H', asteroid_count)
+    rotations = reader.column('B', asteroid_count)
+    restore_asteroid = world.Asteroid.restore
+    for index in range(asteroid_count):
+        x, y, vx, vy, radius = motion[index * 5:index * 5 + 5]
+        if index < len(live):
+            live[index].load_state(x, y, radius, pygame.Vector2(vx, vy), shapes[index], rotations[index])
+        else:
+            restore_asteroid(x, y, radius, pygame.Vector2(vx, vy), shapes[index], rotations[index])
+
+    motion = reader.column('d', order_count * 5)
+    shapes = reader.column('H', order_count)
+    rotations = reader.column('B', order_count)
+    for index in range(order_count):
+        x, y, vx, vy, radius = motion[index * 5:index * 5 + 5]
+        world.spawner.push(x, y, radius, pygame.Vector2(vx, vy), shapes[index], rotations[index])
+
+    motion = reader.column('d', shot_count * 5)
+    homing = reader.column('B', shot_count)
+    targets = reader.column('i', shot_count)
+    asteroids = list(world.asteroids) if shot_count else []
+    shot_pool = world.shot_pool
+    for index in range(shot_count):
+        x, y, vx, vy, shot_lifetime = motion[index * 5:index * 5 + 5]
+        shot = shot_pool.acquire(x, y)
+        shot.velocity = pygame.Vector2(vx, vy)
+        shot.lifetime = shot_lifetime
+        shot.homing = bool(homing[index])
+        if targets[index] >= 0:
+            shot.target = asteroids[targets[index]]
+
+    motion = reader.column('d', powerup_count * 6)
+    kinds = reader.column('B', powerup_count)
+    powerup_class = world.PowerUp
+    for index in range(powerup_count):
+        x, y, vx, vy, powerup_lifetime, pulse_timer = motion[index * 6:index * 6 + 6]
+        powerup = powerup_class(x, y, EFFECTS[EFFECT_NAMES[kinds[index]]])
+        powerup.velocity = pygame.Vector2(vx, vy)
+        powerup.lifetime = powerup_lifetime
+        powerup.pulse_timer = pulse_timer
+
+    values = reader.column('d', animation_count * 3)
+    texts = reader.bytes(text_size).decode().split("\0") if animation_count else []
+    score_animation = world.ScoreAnimation
+    animations = world.score_animations
+    for index in range(animation_count):
+        x, y, animation_lifetime = values[index * 3:index * 3 + 3]
+        animation = score_animation(x, y, texts[index])
+        animation.lifetime = animation_lifetime
+        animations.add(animation)
+
+    values = reader.column('d', explosion_count * 4)
+    explosion_class = world.AsteroidExplosion
+    explosions = world.asteroid_explosions
+    for index in range(explosion_count):
+        x, y, explosion_lifetime, explosion_max_lifetime = values[index * 4:index * 4 + 4]
+        effect = explosion_class.__new__(explosion_class)
+        effect.position = pygame.Vector2(x, y)
+        effect.lifetime = explosion_lifetime
+        effect.max_lifetime = explosion_max_lifetime
+        explosions.add(effect)
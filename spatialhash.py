@@ -0,0 +1,180 @@
+import math
+
+from constants import SPATIAL_HASH_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase for circle shapes.
+
+    Shapes are bucketed into every cell their bounding box overlaps. Cell
+    coordinates are unbounded, so shapes that have drifted past the screen
+    edge (wrap_screen only moves them once they are a full radius outside)
+    land in negative or overflow cells instead of being clamped onto the
+    wrong side of the screen.
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+        self.bounds = None  # Occupied cell range, worked out by nearest() when needed
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+        self.bounds = None
+
+    def _cell_range(self, x, y, radius):
+        size = self.cell_size
+        return (
+            math.floor((x - radius) / size),
+            math.floor((x + radius) / size),
+            math.floor((y - radius) / size),
+            math.floor((y + radius) / size),
+        )
+
+    def insert(self, shape):
+        self.insert_circle(shape, shape.position.x, shape.position.y, shape.hit_radius)
+
+    def insert_circle(self, item, x, y, radius):
+        """Insert any item under the bounding box of the given circle"""
+        # The insertion index lets queries report candidates in the same order
+        # the items were inserted (i.e. the order of the sprite group)
+        entry = (self.count, item)
+        self.count += 1
+
+        min_x, max_x, min_y, max_y = self._cell_range(x, y, radius)
+        cells = self.cells
+        self.bounds = None
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def build(self, shapes):
+        """Rebuild the grid from an iterable of shapes"""
+        self.clear()
+        for shape in shapes:
+            self.insert(shape)
+        return self
+
+    def query(self, position, radius):
+        """Return shapes whose bounding box overlaps the given circle, in insertion order"""
+        return self.query_circle(position.x, position.y, radius)
+
+    def query_circle(self, x, y, radius):
+        min_x, max_x, min_y, max_y = self._cell_range(x, y, radius)
+        cells = self.cells
+        found = {}
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for index, item in bucket:
+                        found[index] = item
+        return _in_order(found)
+
+    def query_segment(self, x0, y0, x1, y1):
+        """Return items in every cell the segment from (x0, y0) to (x1, y1) crosses, in insertion order.
+
+        Walks the cells along the segment one boundary at a time, so a long
+        ray costs one lookup per cell it passes through. Any circle the
+        segment touches is in one of them, since circles are filed under
+        every cell their bounding box overlaps.
+        """
+        size = self.cell_size
+        cx, cy = math.floor(x0 / size), math.floor(y0 / size)
+        steps = abs(math.floor(x1 / size) - cx) + abs(math.floor(y1 / size) - cy)
+        dx, dy = x1 - x0, y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Fraction of the segment to the next cell boundary on each axis, and per whole cell
+        if dx:
+            next_x = ((cx + 1) * size - x0 if dx > 0 else x0 - cx * size) / abs(dx)
+            delta_x = size / abs(dx)
+        else:
+            next_x = delta_x = math.inf
+        if dy:
+            next_y = ((cy + 1) * size - y0 if dy > 0 else y0 - cy * size) / abs(dy)
+            delta_y = size / abs(dy)
+        else:
+            next_y = delta_y = math.inf
+
+        cells = self.cells
+        found = {}
+        for _ in range(steps + 1):
+            bucket = cells.get((cx, cy))
+            if bucket:
+                for index, item in bucket:
+                    found[index] = item
+            if next_x < next_y:
+                cx += step_x
+                next_x += delta_x
+            else:
+                cy += step_y
+                next_y += delta_y
+        return _in_order(found)
+
+    def nearest(self, x, y, max_distance=math.inf, accept=None):
+        """Return the shape whose centre is closest to (x, y), or None.
+
+        Searches rings of cells outward from the point's cell and stops once
+        no unsearched cell can hold anything closer. Shapes farther than
+        max_distance, or that accept(shape) rejects, are skipped; ties go to
+        the first inserted.
+        """
+        cells = self.cells
+        if not cells:
+            return None
+        if self.bounds is None:
+            columns = [key[0] for key in cells]
+            rows = [key[1] for key in cells]
+            self.bounds = (min(columns), max(columns), min(rows), max(rows))
+        min_x, max_x, min_y, max_y = self.bounds
+
+        size = self.cell_size
+        cx, cy = math.floor(x / size), math.floor(y / size)
+        rings = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+        if max_distance != math.inf:
+            rings = min(rings, math.ceil(max_distance / size))
+
+        best = None
+        best_key = (max_distance * max_distance, math.inf)
+        for ring in range(rings + 1):
+            for key in _ring(cx, cy, ring):
+                bucket = cells.get(key)
+                if not bucket:
+                    continue
+                for index, item in bucket:
+                    position = item.position
+                    distance = (position.x - x) ** 2 + (position.y - y) ** 2
+                    if (distance, index) < best_key and (accept is None or accept(item)):
+                        best_key = (distance, index)
+                        best = item
+            # Cells past this ring are at least ring cells away
+            if best is not None and best_key[0] <= (ring * size) ** 2:
+                break
+        return best
+
+
+def _in_order(found):
+    """Values of an insertion index -> item dict, in insertion order"""
+    if len(found) < 2:
+        return list(found.values())
+    return [found[index] for index in sorted(found)]
+
+
+def _ring(cx, cy, ring):
+    """Cells at Chebyshev distance ring from (cx, cy)"""
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for x in range(cx - ring, cx + ring + 1):
+        yield (x, cy - ring)
+        yield (x, cy + ring)
+    for y in range(cy - ring + 1, cy + ring):
+        yield (cx - ring, y)
+        yield (cx + ring, y)
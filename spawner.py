@@ -0,0 +1,134 @@
+"""Asteroid creation spread over ticks.
+
+Splits and the asteroid field don't build asteroids themselves; they push
+an order onto the world's SpawnQueue with every random draw already made
+(shape, rotation, velocity), and the queue builds at most
+asteroid_spawn_budget asteroids a tick. A burst of hits therefore never
+allocates more than a budget's worth of sprites in one frame, and since
+orders are plain numbers they go into save states with the rest of the
+world. The budget is a count rather than a time so that every run,
+replay and rollback makes the same asteroids on the same tick.
+
+Killed asteroids go back to the queue as spares, and ticks that leave
+budget over top the spares up with empty asteroid objects, so a burst
+mostly reuses objects instead of allocating them. A killed asteroid only
+becomes a spare at the end of the tick after it died, so a homing shot
+still aimed at it sees it dead and picks a new target before it can come
+back somewhere else. The field's asteroid cap can also
+be scaled by a DensityController fed with real frame times; only the
+interactive game does that, as it makes the game depend on the machine.
+"""
+from collections import deque
+
+import pygame
+
+
+class SpawnQueue:
+    """Pending asteroids of one world, built a budget's worth per tick"""
+
+    def __init__(self, asteroid_class, budget, prewarm):
+        self.asteroid_class = asteroid_class
+        self.budget = budget  # Asteroids built per update() at most
+        self.prewarm = prewarm  # Spare asteroid objects to keep at most
+        self.orders = deque()
+        self.spares = []
+        self.dead = []  # Asteroids killed since the last update(), spares after it
+        self.density = None  # DensityController scaling the field's cap, if any
+        self.peak = 0  # Longest the queue has been, for tuning the budget
+
+    def __len__(self):
+        return len(self.orders)
+
+    def push(self, x, y, radius, velocity, shape_index, rotation):
+        """Queue an asteroid; the arguments are those of Asteroid.restore()"""
+        self.orders.append((x, y, radius, velocity, shape_index, rotation))
+        self.peak = max(self.peak, len(self.orders))
+
+    def limit(self, max_count):
+        """The field's asteroid cap after density control"""
+        if self.density is None:
+            return max_count
+        return max(1, int(max_count * self.density.scale))
+
+    def recycle(self, asteroid):
+        """Take back a killed asteroid to rebuild later"""
+        self.dead.append(asteroid)
+
+    def update(self):
+        """Build queued asteroids up to the budget, then spares with what is left; returns how many were built"""
+        orders = self.orders
+        built = min(self.budget, len(orders))
+        for _ in range(built):
+            self._build(*orders.popleft())
+
+        # Killed asteroids go on top, so they are reused first; the oldest spares go past prewarm
+        spares = self.spares
+        spares.extend(self.dead)
+        self.dead.clear()
+        del spares[:max(0, len(spares) - self.prewarm)]
+        missing = min(self.budget - built, self.prewarm - len(self.spares))
+        for _ in range(missing):
+            self.spares.append(self._spare())
+        return built
+
+    def flush(self):
+        """Build every queued asteroid now, whatever the budget"""
+        while self.orders:
+            self._build(*self.orders.popleft())
+
+    def clear(self):
+        """Drop pending orders; spares hold no game state and are kept"""
+        self.orders.clear()
+
+    def _spare(self):
+        # Not in any group until it is built, so it takes no part in the game; load_state() fills it in
+        asteroid = self.asteroid_class.__new__(self.asteroid_class)
+        pygame.sprite.Sprite.__init__(asteroid)
+        return asteroid
+
+    def _build(self, x, y, radius, velocity, shape_index, rotation):
+        if not self.spares:
+            return self.asteroid_class.restore(x, y, radius, velocity, shape_index, rotation)
+        asteroid = self.spares.pop()
+        asteroid.load_state(x, y, radius, velocity, shape_index, rotation)
+        asteroid.add(asteroid.containers)
+        return asteroid
+
+    def stats(self):
+        return {
+            'pending': len(self.orders),
+            'spares': len(self.spares),
+            'peak': self.peak,
+        }
+
+
+class DensityController:
+    """Scales asteroid density down while frames take longer than target.
+
+    record() takes the seconds spent working on each frame, not counting
+    the wait for the next one. The scale drops a little on every frame the
+    smoothed time is over target, and creeps back once frames are well
+    under it, so the field thins out under load instead of hitching.
+    """
+
+    SMOOTHING = 0.1  # Weight of the newest frame in the running average
+    BACK_OFF = 0.98  # Scale kept per slow frame
+    RECOVERY = 0.005  # Scale regained per fast frame
+    HEADROOM = 0.75  # Fraction of target a frame must come in under to count as fast
+
+    def __init__(self, target, minimum):
+        self.target = target
+        self.minimum = minimum
+        self.scale = 1.0
+        self.average = None
+
+    def record(self, frame_time):
+        if self.average is None:
+            self.average = frame_time
+        else:
+            self.average += (frame_time - self.average) * self.SMOOTHING
+
+        if self.average > self.target:
+            self.scale = max(self.minimum, self.scale * self.BACK_OFF)
+        elif self.average < self.target * self.HEADROOM:
+            self.scale = min(1.0, self.scale + self.RECOVERY)
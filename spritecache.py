@@ -0,0 +1,103 @@
+import math
+import pygame
+
+from constants import SPRITE_RENDER_MODE
+
+RENDER_MODES = ("baked", "vector", "compare")
+render_mode = SPRITE_RENDER_MODE  # Current mode, see set_render_mode()
+
+
+def bake_polygon(points, color="white", width=2):
+    """Rasterise a polygon given around the origin once.
+
+    Returns the surface and the offset from the origin to its top-left
+    corner, so drawing is `screen.blit(surface, position + offset)`.
+    """
+    min_x = math.floor(min(p[0] for p in points)) - width
+    min_y = math.floor(min(p[1] for p in points)) - width
+    max_x = math.ceil(max(p[0] for p in points)) + width
+    max_y = math.ceil(max(p[1] for p in points)) + width
+
+    surface = pygame.Surface((max_x - min_x + 1, max_y - min_y + 1), pygame.SRCALPHA)
+    pygame.draw.polygon(surface, color, [(p[0] - min_x, p[1] - min_y) for p in points], width)
+    return surface, pygame.Vector2(min_x, min_y)
+
+
+class RotationCache:
+    """Baked copies of a polygon at evenly spaced rotations"""
+
+    def __init__(self, points, steps, color="white", width=2):
+        self.step_angle = 360 / steps
+        self.frames = [
+            bake_polygon([pygame.Vector2(p).rotate(i * self.step_angle) for p in points], color, width)
+            for i in range(steps)
+        ]
+
+    def get(self, rotation):
+        """Return (surface, offset) for the cached rotation nearest to rotation"""
+        return self.frames[round(rotation / self.step_angle) % len(self.frames)]
+
+
+class PixelComparison:
+    """Counts how far baked sprites drift from the vector drawing path"""
+
+    def __init__(self):
+        self.draws = 0
+        self.pixels = 0
+        self.mismatched = 0
+
+    def compare(self, surface, topleft, world_points, color="white", width=2):
+        """Render a baked blit and the vector polygon it replaces side by side and tally differing pixels"""
+        size = surface.get_size()
+        baked = pygame.Surface(size)
+        vector = pygame.Surface(size)
+        baked.blit(surface, (0, 0))
+        pygame.draw.polygon(vector, color, [(p[0] - topleft[0], p[1] - topleft[1]) for p in world_points], width)
+
+        # Masks of black pixels; their symmetric difference is every pixel that disagrees
+        baked_mask = pygame.mask.from_threshold(baked, (0, 0, 0), (1, 1, 1, 255))
+        vector_mask = pygame.mask.from_threshold(vector, (0, 0, 0), (1, 1, 1, 255))
+        difference = baked_mask.copy()
+        difference.erase(vector_mask, (0, 0))
+        vector_mask.erase(baked_mask, (0, 0))
+        difference.draw(vector_mask, (0, 0))
+
+        self.draws += 1
+        self.pixels += size[0] * size[1]
+        self.mismatched += difference.count()
+
+    def report(self):
+        if not self.pixels:
+            return "sprite compare: nothing drawn"
+        return (f"sprite compare: {self.draws} draws, {self.mismatched} of {self.pixels} pixels differ "
+                f"({100 * self.mismatched / self.pixels:.3f}%)")
+
+
+pixel_comparison = PixelComparison()
+
+
+def set_render_mode(mode):
+    """Switch how draw_polygon() draws: one of RENDER_MODES"""
+    global render_mode
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode: {mode}")
+    render_mode = mode
+
+
+def draw_polygon(screen, position, baked, points, color="white", width=2):
+    """Draw a shape baked around the origin at position, honouring the render mode.
+
+    points may be a callable, so callers only build the vector outline when
+    the vector path actually needs it.
+    """
+    surface, offset = baked
+    topleft = (round(position.x + offset.x), round(position.y + offset.y))
+    if render_mode == "baked":
+        return screen.blit(surface, topleft)
+
+    if callable(points):
+        points = points()
+    world_points = [position + p for p in points]
+    if render_mode == "compare":
+        pixel_comparison.compare(surface, topleft, world_points, color, width)
+    return pygame.draw.polygon(screen, color, world_points, width)
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Up to this many shot-asteroid pairs the broadphase is one dense NumPy
+# distance test; above it, per-shot spatial hash queries are cheaper
+DENSE_PAIR_LIMIT = 250_000
+
+
+def time_of_impact(a_start, a_end, a_radius, b_start, b_end, b_radius):
+    """Earliest fraction of a step at which pairs of moving circles touch.
+
+    Each circle moves in a straight line from its start to its end
+    position over the step. Arguments are arrays of shape (n, 2) for
+    positions and (n,) for radii, one row per pair. Returns an (n,) array
+    of times in [0, 1], or inf where the pair never touches. Pairs that
+    already overlap at the start hit at time 0.
+    """
+    offset = b_start - a_start
+    motion = (b_end - b_start) - (a_end - a_start)
+    reach = a_radius + b_radius
+
+    # |offset + t * motion| = reach is a quadratic in t
+    a = np.einsum("ij,ij->i", motion, motion)
+    b = 2 * np.einsum("ij,ij->i", offset, motion)
+    c = np.einsum("ij,ij->i", offset, offset) - reach * reach
+
+    toi = np.full(len(offset), np.inf)
+    disc = b * b - 4 * a * c
+    moving = (a > 0) & (disc >= 0)
+    toi[moving] = (-b[moving] - np.sqrt(disc[moving])) / (2 * a[moving])
+    toi[(toi < 0) | (toi > 1)] = np.inf
+    toi[c <= 0] = 0.0
+    return toi
+
+
+def step_segments(shapes, dt, age=None):
+    """Start and end positions of each shape's motion over the last step.
+
+    The start is rebuilt as position - velocity * dt rather than
+    remembered, so a shape that wrapped this step gets a short segment
+    leading up to where it is now instead of one across the whole screen.
+    age(shape), if given, caps the segment for shapes younger than a step.
+    """
+    motion = np.array([(*shape.position, *shape.velocity) for shape in shapes], dtype=float).reshape(-1, 4)
+    end = motion[:, :2]
+    travel = np.full(len(end), dt)
+    if age is not None:
+        travel = np.minimum(travel, [max(0.0, age(shape)) for shape in shapes])
+    return end - motion[:, 2:] * travel[:, None], end
+
+
+def swept_hits(shots, asteroids, grid, dt, shot_age=None):
+    """Shot and asteroid pairs that touched during the last step, earliest first.
+
+    Returns (time, shot, asteroid) tuples. grid is a SpatialHash, rebuilt
+    here from the asteroids' swept bounds. A shot or asteroid may appear
+    in several pairs; the caller decides which hits still apply.
+    """
+    if not shots or not asteroids:
+        return []
+
+    shot_start, shot_end = step_segments(shots, dt, shot_age)
+    asteroid_start, asteroid_end = step_segments(asteroids, dt)
+    shot_radius = np.array([shot.radius for shot in shots], dtype=float)
+    asteroid_radius = np.array([asteroid.hit_radius for asteroid in asteroids], dtype=float)
+
+    # Broadphase on circles bounding each whole motion segment
+    asteroid_center = (asteroid_start + asteroid_end) / 2
+    asteroid_bounds = asteroid_radius + np.hypot(*(asteroid_end - asteroid_start).T) / 2
+    shot_center = (shot_start + shot_end) / 2
+    shot_bounds = shot_radius + np.hypot(*(shot_end - shot_start).T) / 2
+
+    if len(shots) * len(asteroids) <= DENSE_PAIR_LIMIT:
+        # Per-axis differences keep the (shots, asteroids) temporaries 2-D
+        dx = shot_center[:, 0, None] - asteroid_center[None, :, 0]
+        dy = shot_center[:, 1, None] - asteroid_center[None, :, 1]
+        reach = shot_bounds[:, None] + asteroid_bounds[None, :]
+        i, j = np.nonzero(dx * dx + dy * dy <= reach * reach)
+    else:
+        grid.clear()
+        for index in range(len(asteroids)):
+            grid.insert_circle(index, asteroid_center[index, 0], asteroid_center[index, 1], asteroid_bounds[index])
+        shot_index = []
+        asteroid_index = []
+        for index in range(len(shots)):
+            for other in grid.query_circle(shot_center[index, 0], shot_center[index, 1], shot_bounds[index]):
+                shot_index.append(index)
+                asteroid_index.append(other)
+        i = np.array(shot_index, dtype=int)
+        j = np.array(asteroid_index, dtype=int)
+    if not len(i):
+        return []
+
+    # Narrowphase over every candidate pair at once
+    toi = time_of_impact(shot_start[i], shot_end[i], shot_radius[i],
+                         asteroid_start[j], asteroid_end[j], asteroid_radius[j])
+    hits = np.flatnonzero(np.isfinite(toi))
+    order = hits[np.argsort(toi[hits], kind="stable")]
+    return [(float(toi[k]), shots[i[k]], asteroids[j[k]]) for k in order]
@@ -0,0 +1,133 @@
+import asyncio
+
+from server import (JOIN, JOIN_MESSAGE, INPUT, INPUT_MESSAGE, MAX_DATAGRAM, NO_BASE, LoopbackClient, Server,
+                    decode_snapshot, encode_snapshot, load_test)
+
+
+class SentDatagrams:
+    """Transport stand-in keeping what the server sends"""
+
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, address):
+        self.sent.append((data, address))
+
+
+def test_full_snapshot_round_trip():
+    state = {0: (0, 100, 200, 9000), 1: (1, -40, 3000, 60), 7: (2, 5, 6, 5)}
+    data = encode_snapshot(3, 30, state, 1200, 2)
+    header, decoded = decode_snapshot(data, {})
+    assert header == {'room': 3, 'tick': 30, 'score': 1200, 'lives': 2}
+    assert decoded == state
+
+
+def test_delta_snapshot_round_trip():
+    base = {0: (0, 100, 200, 9000), 1: (1, 400, 400, 60), 2: (2, 10, 10, 5), 3: (1, 0, 0, 40)}
+    state = {
+        0: (0, 100, 200, 9000),  # unchanged
+        1: (1, 410, 395, 60),  # small move, sent as a delta
+        2: (2, 900, 10, 5),  # too far for a delta, sent in full
+        4: (3, 50, 60, 12),  # new
+    }  # 3 removed
+    data = encode_snapshot(3, 33, state, 0, 3, base_tick=30, base=base)
+    full = encode_snapshot(3, 33, state, 0, 3)
+    assert len(data) == len(full) == 1
+    assert len(data[0]) < len(full[0])
+    _, decoded = decode_snapshot(data, {30: base})
+    assert decoded == state
+
+
+def test_delta_against_unknown_base_is_rejected():
+    base = {0: (0, 1, 2, 3)}
+    data = encode_snapshot(3, 33, {0: (0, 2, 2, 3)}, 0, 3, base_tick=30, base=base)
+    assert decode_snapshot(data, {27: base}) is None
+
+
+def test_oversized_snapshot_is_split_into_datagrams():
+    state = {entity_id: (1, entity_id % 30000, -entity_id % 30000, 40) for entity_id in range(15000)}
+    data = encode_snapshot(3, 30, state, 0, 3)
+    assert len(data) > 1
+    assert all(len(datagram) <= MAX_DATAGRAM for datagram in data)
+    _, decoded = decode_snapshot(data[::-1], {})
+    assert decoded == state
+
+    # A delta with every entity moved and some removed is split too
+    moved = {entity_id: (kind, x + 3, y - 2, detail) for entity_id, (kind, x, y, detail) in state.items()
+             if entity_id % 7}
+    data = encode_snapshot(3, 33, moved, 0, 3, base_tick=30, base=state)
+    assert len(data) > 1
+    assert all(len(datagram) <= MAX_DATAGRAM for datagram in data)
+    _, decoded = decode_snapshot(data, {30: state})
+    assert decoded == moved
+
+
+def test_big_room_reaches_the_client_in_parts():
+    server = Server()
+    server.transport = SentDatagrams()
+    viewer = ("127.0.0.1", 1000)
+    server.datagram_received(JOIN_MESSAGE.pack(JOIN, 1), viewer)
+    room = server.rooms[1]
+    # More entities than one datagram holds
+    state = {entity_id: (1, entity_id, entity_id, 40) for entity_id in range(10000)}
+    room.capture = lambda: dict(state)
+    for _ in range(3):
+        server.step()
+    datagrams = [data for data, address in server.transport.sent]
+    assert len(datagrams) > 1
+    assert all(len(data) <= MAX_DATAGRAM for data in datagrams)
+    assert server.bytes_sent == sum(map(len, datagrams))
+
+    client = LoopbackClient(1)
+    for data in datagrams:
+        assert client.snapshots == 0
+        client.datagram_received(data, None)
+    assert client.snapshots == 1
+    assert client.state == state
+
+
+def test_loopback_client_receives_snapshots():
+    async def play():
+        loop = asyncio.get_running_loop()
+        server = Server()
+        server_transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+        address = server_transport.get_extra_info("sockname")
+        client_transport, client = await loop.create_datagram_endpoint(lambda: LoopbackClient(5),
+                                                                       remote_addr=address)
+        try:
+            for _ in range(30):
+                client.send_input()
+                server.step()
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.05)  # Let the last snapshots arrive
+        finally:
+            client_transport.close()
+            server_transport.close()
+        return server, client
+
+    server, client = asyncio.run(play())
+    assert list(server.rooms) == [5]
+    assert client.snapshots > 0
+    assert client.header['room'] == 5
+    # The client flies the ship, so it sees it in the room's state
+    assert any(kind == 0 for kind, *_ in client.state.values())
+
+
+def test_load_test_has_no_stale_snapshots():
+    summary = asyncio.run(load_test(2, 0.5))
+    assert summary['ticks'] > 0
+    assert summary['snapshots_received'] > 0
+    assert summary['stale_snapshots'] == 0
+
+
+def test_silent_clients_are_dropped_and_rooms_closed():
+    server = Server(client_timeout=0.5)  # 30 ticks
+    talker = ("127.0.0.1", 1000)
+    ghost = ("127.0.0.1", 1001)
+    server.datagram_received(JOIN_MESSAGE.pack(JOIN, 1), talker)
+    server.datagram_received(JOIN_MESSAGE.pack(JOIN, 2), ghost)
+    for tick in range(40):
+        server.datagram_received(INPUT_MESSAGE.pack(INPUT, 1, tick, 0, NO_BASE), talker)
+        server.step()
+    assert list(server.rooms) == [1]
+    assert list(server.rooms[1].clients) == [talker]
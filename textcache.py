@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from constants import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color="white"):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class GlyphAtlas:
+    """Pre-rendered glyphs for strings drawn from a small alphabet, like the score"""
+
+    def __init__(self, font, color="white", glyphs="0123456789"):
+        self.glyphs = {glyph: font.render(glyph, True, color) for glyph in glyphs}
+        self.height = max(surface.get_height() for surface in self.glyphs.values())
+
+    def size(self, text):
+        return sum(self.glyphs[glyph].get_width() for glyph in text), self.height
+
+    def draw(self, screen, text, topleft=None, topright=None):
+        """Blit text glyph by glyph; returns the covered rect"""
+        width, height = self.size(text)
+        if topright is not None:
+            x, y = topright[0] - width, topright[1]
+        else:
+            x, y = topleft
+
+        blits = []
+        offset = x
+        for glyph in text:
+            surface = self.glyphs[glyph]
+            blits.append((surface, (offset, y)))
+            offset += surface.get_width()
+        screen.blits(blits, doreturn=False)
+        return pygame.Rect(x, y, width, height)
+
+
+# Shared by the game states and HUD elements
+text_cache = TextCache()
+
+
+class FontLoader:
+    """Opens a font file at several sizes on a background thread.
+
+    Start it as early as possible; get() waits for the load only if it
+    hasn't finished yet, so the file read overlaps the rest of startup.
+    """
+
+    def __init__(self, path, sizes):
+        self.path = path
+        self.sizes = sizes
+        self.fonts = {}
+        self.error = None
+        self.thread = threading.Thread(target=self._load, name="font-loader", daemon=True)
+        self.thread.start()
+
+    def _load(self):
+        try:
+            for size in self.sizes:
+                self.fonts[size] = pygame.font.Font(self.path, size)
+        except Exception as error:  # Re-raised on the main thread by get()
+            self.error = error
+
+    def get(self, size):
+        self.thread.join()
+        if self.error:
+            raise self.error
+        return self.fonts[size]
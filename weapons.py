@@ -0,0 +1,133 @@
+"""Guns the ship can fire, picked up as timed power-ups.
+
+Every weapon fires a volley per trigger pull: a list of shot velocities
+launched together through the shared ShotPool, so a five-way spread costs
+one pool call rather than five trips through Player.shoot. The laser
+fires no shots at all; its Beam is resolved as a ray against the asteroid
+grid during the collision phase. Homing missiles are ordinary shots with
+a target, which PlayingState picks from the grid with a nearest-neighbour
+search and steers them towards. Cooldowns, spreads, speeds, the homing
+turn rate and the beam lifetime are world settings, read from the ship's
+config on every shot.
+"""
+import math
+
+import pygame
+
+from shot import Shot
+
+
+def emit(player, velocities):
+    """Launch one shot per velocity from the ship, through its shot pool when it has one"""
+    x, y = player.position
+    if player.shot_pool:
+        return player.shot_pool.fire(x, y, velocities)
+    shots = []
+    for velocity in velocities:
+        shot = Shot(x, y)
+        shot.velocity = velocity
+        shots.append(shot)
+    return shots
+
+
+def guide(shot, dt):
+    """Turn a homing shot towards its target by at most config.homing_turn_rate * dt degrees"""
+    velocity = shot.velocity
+    angle = velocity.angle_to(shot.target.position - shot.position)
+    angle = (angle + 180) % 360 - 180
+    turn = shot.config.homing_turn_rate * dt
+    # Assigned rather than rotated in place, so store-backed shots keep the change
+    shot.velocity = velocity.rotate(max(-turn, min(turn, angle)))
+
+
+class Weapon:
+    """One kind of gun, tuned by the weapon_* settings under its name.
+
+    weapon_cooldowns scales player_shoot_cooldown between volleys,
+    weapon_spreads lists the angles of the shots in a volley relative to
+    the ship's heading, and weapon_shot_speeds is their speed as a fraction
+    of player_shoot_speed.
+    """
+
+    name = None
+
+    def cooldown(self, config):
+        return config.weapon_cooldowns.get(self.name, 1.0)
+
+    def fire(self, player):
+        config = player.config
+        speed = config.player_shoot_speed * config.weapon_shot_speeds.get(self.name, 1.0)
+        forward = pygame.Vector2(0, 1).rotate(player.rotation) * speed
+        return emit(player, [forward.rotate(offset) for offset in config.weapon_spreads.get(self.name, (0,))])
+
+
+class Blaster(Weapon):
+    """The ship's own gun, one shot straight ahead"""
+
+    name = "blaster"
+
+    def fire(self, player):
+        shot_speed = player.config.player_shoot_speed
+        return emit(player, (pygame.Vector2(0, 1).rotate(player.rotation) * shot_speed,))
+
+
+class SpreadGun(Weapon):
+    """Five shots in a fan"""
+
+    name = "spread"
+
+
+class HomingLauncher(Weapon):
+    """Two slower missiles that each chase the asteroid nearest to them"""
+
+    name = "homing"
+
+    def fire(self, player):
+        shots = super().fire(player)
+        for shot in shots:
+            shot.homing = True
+        return shots
+
+
+class Laser(Weapon):
+    """Instant beam that destroys the first asteroid in its path"""
+
+    name = "laser"
+
+    def fire(self, player):
+        config = player.config
+        direction = pygame.Vector2(0, 1).rotate(player.rotation)
+        # Long enough to cross the screen from anywhere on it
+        length = math.hypot(config.screen_width, config.screen_height)
+        beam = Beam(player.position + direction * player.radius, direction, length, config.laser_beam_lifetime)
+        player.beams.add(beam)
+        return beam
+
+
+# Weapons by name; the power-ups of the same names switch to them
+WEAPONS = {weapon.name: weapon for weapon in (Blaster(), SpreadGun(), HomingLauncher(), Laser())}
+
+
+class Beam:
+    """Laser shot, cut short at the first asteroid it hits once PlayingState resolves it"""
+
+    __slots__ = ("start", "direction", "length", "lifetime", "max_lifetime", "resolved")
+
+    def __init__(self, start, direction, length, lifetime):
+        self.start = start
+        self.direction = direction
+        self.length = length
+        self.lifetime = self.max_lifetime = lifetime
+        self.resolved = False
+
+    @property
+    def end(self):
+        return self.start + self.direction * self.length
+
+    def update(self, dt):
+        self.lifetime -= dt
+        return self.lifetime > 0
+
+    def draw(self, screen):
+        width = max(1, round(3 * self.lifetime / self.max_lifetime))
+        return pygame.draw.line(screen, "red", self.start, self.end, width)
@@ -0,0 +1,58 @@
+class World:
+    """Everything the game states share for one game, built by create_world().
+
+    Slotted: reading a field is a plain attribute load, and a misspelt
+    field fails on assignment instead of quietly adding a new one.
+    """
+
+    __slots__ = (
+        'config',
+        'seed',
+        'game_seed',
+        'timestep',
+        'rng',
+        'recorder',
+        'font',
+
+        # Sprite groups and tagged views of the registry
+        'updatable',
+        'drawable',
+        'registry',
+        'asteroids',
+        'shots',
+        'powerups',
+        'entity_store',
+        'particles',
+        'shot_pool',
+        'expired',
+        'effects',
+
+        # Current game
+        'player',
+        'explosion',
+        'asteroid_field',
+        'spawner',
+        'lives',
+        'respawn_timer',
+        'score',
+        'asteroids_destroyed',
+        'shields_used',
+        'score_animations',
+        'asteroid_explosions',
+        'beams',
+
+        # Factories and this world's entity classes
+        'spawn_player',
+        'create_explosion',
+        'draw_heart',
+        'Asteroid',
+        'AsteroidField',
+        'AsteroidExplosion',
+        'PlayerExplosion',
+        'ScoreAnimation',
+        'PowerUp',
+    )
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)